@@ -20,12 +20,49 @@ from openmdao.api import ScipyOptimizer  # Optimizer driver
 from openmdao.api import FullFactorialDriver  # FullFactorialDriver driver
 from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
 from openmdao.api import SubProblem  # Allows for nested drivers - not currently supported in OpenMETA - Introduced in OpenMDAO v.1.7.2.
+from openmdao.components.subproblem import _reraise  # Prefixes an error with the SubProblem it came from, as SubProblem does
+from openmdao.core.system import AnalysisError  # A failed analysis - drivers record the case as failed and carry on
 from openmdao.api import SqliteRecorder  # Recorder
+from openmdao.util.record_util import create_local_meta, update_local_meta, format_iteration_coordinate
+from openmdao.recorders.base_recorder import BaseRecorder
 import sqlitedict
+import sqlite3
+import six
+import sys
+import os
 import random
 import time
+import json
+import threading
+import numpy as np
+from collections import OrderedDict, deque, namedtuple
+try:
+    from http.server import HTTPServer, BaseHTTPRequestHandler  # Python 3
+except ImportError:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler  # Python 2
+try:
+    import tracemalloc  # Python 3.4+
+except ImportError:
+    tracemalloc = None
+try:
+    import resource  # not on Windows
+except ImportError:
+    resource = None
 from pprint import pprint
 
+# Index-based access to a Component's variables
+def bind_slots(*vectors):
+    ''' Returns a namedtuple with one slot per variable, each a view into the contiguous float64 array behind the given params/unknowns,
+    so solve_nonlinear can read and write slots.x[0] without a dict lookup and metadata indirection on every access.
+    The params['x']/unknowns['f_xy'] interface keeps working alongside. Returns None if a variable isn't in the array - an
+    unconnected param keeps its value in a wrapper object - so the caller can stay on that interface. '''
+    
+    names = [name for vec in vectors for name in vec._dat]
+    views = [vec._dat[name].val for vec in vectors for name in vec._dat]
+    if not all(isinstance(view, np.ndarray) for view in views):
+        return None
+    return namedtuple('Slots', names)(*views)
+
 # 'Paraboloid' Component
 class Paraboloid(Component):
     ''' Evaluates the equation f(x,y) = (x-3)^2 +xy +(y+4)^2 - 3 '''
@@ -38,13 +75,23 @@ class Paraboloid(Component):
         
         self.add_output('f_xy', shape=1)
         
+        self._slots = None  # False once binding has failed
+        
     def solve_nonlinear(self, params, unknowns, resids):
         ''' f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3 '''
         
-        x = params['x']
-        y = params['y']
+        # Paraboloid runs on every COBYLA iteration of every case, so bind its slots once and skip the per-access lookups
+        if self._slots is None:
+            self._slots = bind_slots(params, unknowns) or False
+        slots = self._slots
+        if not slots:
+            unknowns['f_xy'] = (params['x']-3.0)**2 + params['x']*params['y'] + (params['y']+4.0)**2 - 3.0
+            return
+        
+        x = slots.x[0]
+        y = slots.y[0]
         
-        unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+        slots.f_xy[0] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
         
 # 'SaveTime' Component
 class SaveTime(Component):
@@ -81,9 +128,756 @@ class MeasureTime(Component):
         except IOError:
             unknowns['time'] = -1.0
 
+# 'DirectTransferSubProblem' SubProblem
+class DirectTransferSubProblem(SubProblem):
+    """ SubProblem that moves its exposed params and unknowns across the Problem boundary through numpy views bound once, on
+    the first run, straight into the parent's and the inner Problem's vectors - instead of a name lookup per variable every run.
+    The views need every exposed param to be an unknown of the inner Problem, e.g. an IndepVarComp output, and every exposed
+    variable to live in its vector's array - an unconnected param doesn't; otherwise each run goes through SubProblem.solve_nonlinear.
+    Before each run it passes the lineage of the case - one (SubProblem pathname, case index) per nesting level, outermost first -
+    as 'case_path' to the SubProblems nested in the inner Problem and to its driver's recorders that have a 'case_path'. """
+
+    def __init__(self, problem, params=(), unknowns=()):
+        super(DirectTransferSubProblem, self).__init__(problem, params=params, unknowns=unknowns)
+
+        self._exposed_params = list(params)
+        self._exposed_unknowns = list(unknowns)
+        self._direct = None  # whether the views can be used - known after setup
+        self._param_views = None  # [(inner Problem view, parent params view)]
+        self._unknown_views = None  # [(parent unknowns view, inner Problem view)]
+        self.case_path = ()  # lineage of the parent's current case - set by the enclosing DirectTransferSubProblem
+        self._parent_case = None  # case_path when this SubProblem was last run
+        self._case = 0  # number of runs within the parent's current case
+        self._case_path_targets = None  # the inner Problem's SubProblems and recorders that take a case_path
+
+    def _bind_views(self, params, unknowns, resids):
+        root = self._problem.root
+        self._param_views = [(root.unknowns._dat[name].val, params._dat[name].val) for name in self._exposed_params]
+        self._unknown_views = [(unknowns._dat[name].val, root.unknowns._dat[name].val) for name in self._exposed_unknowns]
+        self._unknown_views += [(resids._dat[name].val, root.resids._dat[name].val) for name in self._exposed_unknowns]
+        # The inner run may change those inner unknowns (e.g. an inner optimizer's desvars), so they are copied back too
+        self._unknown_views += [(src, dst) for dst, src in self._param_views]
+
+    def _run_direct(self, params, unknowns, resids):
+        try:
+            for dst, src in self._param_views:
+                dst[:] = src
+            self._problem.run()
+            for dst, src in self._unknown_views:
+                dst[:] = src
+        except:
+            _reraise(self.pathname, sys.exc_info())
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        if not self.is_active():
+            return
+        # The vectors are allocated once at setup, so views bound on the first run stay valid for every later run
+        if self._direct is None:
+            self._direct = set(self._unknowns_as_params) == set(self._exposed_params)
+            if self._direct:
+                self._bind_views(params, unknowns, resids)
+                self._direct = all(isinstance(view, np.ndarray) for pair in self._param_views + self._unknown_views for view in pair)
+
+        # Each run is one case of the parent's driver; count them from 0 again whenever the parent moves on to its next case
+        if self.case_path != self._parent_case:
+            self._parent_case = self.case_path
+            self._case = 0
+        if self._case_path_targets is None:
+            self._case_path_targets = list(self._problem.root.subsystems(recurse=True, typ=DirectTransferSubProblem))
+            self._case_path_targets += [rec for rec in self._problem.driver.recorders if hasattr(rec, 'case_path')]
+        case_path = self.case_path + ((self.pathname, self._case),)
+        for target in self._case_path_targets:
+            target.case_path = case_path
+        self._case += 1
+
+        if self._direct:
+            self._run_direct(params, unknowns, resids)
+        else:
+            super(DirectTransferSubProblem, self).solve_nonlinear(params, unknowns, resids)
+
+# Raised inside a GuardedSubProblem's inner Problem when a case has used up its budget
+class CaseBudgetExceeded(AnalysisError):
+    pass
+
+# Errors that fail one GuardedSubProblem case: failed analyses (including a used-up budget) and numerical errors
+CASE_ERRORS = (AnalysisError, ArithmeticError, np.linalg.LinAlgError)
+
+# 'GuardedSubProblem' SubProblem
+class GuardedSubProblem(DirectTransferSubProblem):
+    """ DirectTransferSubProblem with a per-case budget. A case may run for at most max_time seconds and max_evals evaluations of the
+    inner model. A case that goes over budget, or raises one of CASE_ERRORS, is abandoned: its exposed unknowns are set to NaN, the
+    failure is appended to self.failures, and an AnalysisError is raised, so the parent's driver records the case with success = 0 and
+    the reason as its msg, and moves on to its next case. Any other error is raised as it is. The budget is checked before every inner
+    evaluation, so a single evaluation that hangs is not interrupted. """
+
+    def __init__(self, problem, params=(), unknowns=(), max_time=None, max_evals=None):
+        super(GuardedSubProblem, self).__init__(problem, params=params, unknowns=unknowns)
+
+        self.max_time = max_time  # seconds per case (None - no limit)
+        self.max_evals = max_evals  # inner model evaluations per case (None - no limit)
+        self.failures = []  # [(case number, {param: value}, reason)]
+        self._guarded = False
+        self._cases = 0
+        self._start = None
+        self._evals = 0
+
+    def _guard(self):
+        """ Makes every evaluation of the inner model check this case's budget first. """
+
+        root = self._problem.root
+        solve_nonlinear = root.solve_nonlinear
+
+        def guarded_solve_nonlinear(*args, **kwargs):
+            self._evals += 1
+            if self.max_evals is not None and self._evals > self.max_evals:
+                raise CaseBudgetExceeded('more than {} evaluations'.format(self.max_evals))
+            if self.max_time is not None and time.time() - self._start > self.max_time:
+                raise CaseBudgetExceeded('more than {} s'.format(self.max_time))
+            return solve_nonlinear(*args, **kwargs)
+
+        root.solve_nonlinear = guarded_solve_nonlinear
+        self._guarded = True
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        if not self._guarded:
+            self._guard()
+
+        self._cases += 1
+        self._start = time.time()
+        self._evals = 0
+        try:
+            super(GuardedSubProblem, self).solve_nonlinear(params, unknowns, resids)
+        except CASE_ERRORS as e:
+            reason = '{}: {}'.format(type(e).__name__, e)
+            self.failures.append((self._cases, dict((name, float(params[name])) for name in self._exposed_params), reason))
+            print('{} case {} failed - {}'.format(self.pathname, self._cases, reason))
+            for name in self._exposed_unknowns:
+                unknowns[name] = np.nan
+            raise AnalysisError('{} case {} failed - {}'.format(self.pathname, self._cases, reason))
+
+# Nesting levels (including the recording driver's own) that PolicySqliteRecorder indexes
+MAX_DEPTH = 6
+
+# Keys of the recorded iterations under a case, e.g. find_cases('record_results_optimization_problem', 3, 7) - every iteration
+# recorded for case 7 of OptimizationProfiler within case 3 of OptimizationProfilerRepeat. One indexed lookup, no unpickling.
+def find_cases(filename, *cases):
+    conn = sqlite3.connect(filename)
+    where = ' AND '.join('c{} = ?'.format(i) for i in range(len(cases))) or '1'
+    keys = [key for key, in conn.execute('SELECT key FROM case_coordinates WHERE {} ORDER BY rowid'.format(where), cases)]
+    conn.close()
+    return keys
+
+# 'PolicySqliteRecorder' Recorder
+class PolicySqliteRecorder(SqliteRecorder):
+    """ SqliteRecorder with a recording policy for the driver it is attached to:
+    every iteration (record_every = 1), every Nth iteration (record_every = N), or only the final
+    state of each run of the driver (record_final_only = True, added with attach()), e.g. the converged point of an inner optimization.
+    Use options['includes'] to record only a selected list of variables.
+    Iterations recorded inside DirectTransferSubProblems carry the lineage of their case (case_path) in a 'lineage' field, e.g.
+    [['OptimizationProfiler', 3], ['OptimizationProblem', 7]], and are keyed by it, e.g. 'OptimizationProfiler|3|OptimizationProblem|7/rank0:Driver|0',
+    so the runs of the inner driver don't overwrite each other; the iteration coordinate itself is left as the driver made it. The case
+    indices of each key are stored in the indexed 'case_coordinates' table - see find_cases(). """
+
+    def __init__(self, out, **sqlite_dict_args):
+        super(PolicySqliteRecorder, self).__init__(out, **sqlite_dict_args)
+
+        self.options.add_option('record_every', 1, lower=1, desc='Record every Nth iteration')
+        self.options.add_option('record_final_only', False, desc='Only record the final state of each driver run - see attach()')
+
+        self._count = 0
+        self.case_path = ()  # set by the DirectTransferSubProblem the recorded driver runs in
+
+        if hasattr(self, 'out_iterations'):  # only the process that writes the file keeps the table
+            conn = self.out_iterations.conn
+            conn.execute('DROP TABLE IF EXISTS case_coordinates')
+            conn.execute('CREATE TABLE case_coordinates (key TEXT PRIMARY KEY, depth INTEGER, {})'.format(
+                ', '.join('c{} INTEGER'.format(i) for i in range(MAX_DEPTH))))
+            conn.execute('CREATE INDEX case_coordinates_cases ON case_coordinates ({})'.format(
+                ', '.join('c{}'.format(i) for i in range(MAX_DEPTH))))
+
+    def attach(self, driver):
+        """ Adds this recorder to 'driver'. With record_final_only, the recorder also records the model once each time driver.run()
+        returns. For a driver with an optimizer result (ScipyOptimizer), the model is first evaluated at that result, since the
+        last point the optimizer tried needn't be the point it returned. """
+
+        driver.add_recorder(self)
+        run = driver.run
+
+        def run_and_record(problem):
+            result = run(problem)
+            if self.options['record_final_only']:
+                self._record_final(driver)
+            return result
+        driver.run = run_and_record
+
+    def _record_final(self, driver):
+        root = driver.root
+        optimum = getattr(getattr(driver, 'result', None), 'x', None)
+        if optimum is not None:
+            i = 0
+            for name, meta in driver.get_desvar_metadata().items():
+                driver.set_desvar(name, optimum[i:i+meta['size']])
+                i += meta['size']
+            with root._dircontext:
+                root.solve_nonlinear()
+
+        metadata = create_local_meta(None, 'Driver')
+        update_local_meta(metadata, (driver.iter_count,))
+        metadata['timestamp'] = time.time()
+        metadata['success'] = getattr(driver, 'exit_flag', 1)
+        metadata['msg'] = 'Final state'
+        self._write(root.params, root.unknowns, root.resids, metadata)
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        if self.options['record_final_only']:
+            return  # attach() records the final state when the driver's run returns
+
+        self._count += 1
+        if (self._count - 1) % self.options['record_every'] == 0:
+            self._write(params, unknowns, resids, metadata)
+
+    def _write(self, params, unknowns, resids, metadata):
+        # SqliteRecorder.record_iteration, with the case's lineage in the key and the record
+        coord = metadata['coord']
+        key = format_iteration_coordinate(coord)
+        if self.case_path:
+            key = '|'.join('{}|{}'.format(name, case) for name, case in self.case_path) + '/' + key
+
+        data = OrderedDict()
+        data['timestamp'] = metadata['timestamp']
+        data['success'] = metadata['success']
+        data['msg'] = metadata['msg']
+        data['lineage'] = [[name, case] for name, case in self.case_path]
+        if self.options['record_params']:
+            data['Parameters'] = self._filter_vector(params, 'p', coord)
+        if self.options['record_unknowns']:
+            data['Unknowns'] = self._filter_vector(unknowns, 'u', coord)
+        if self.options['record_resids']:
+            data['Residuals'] = self._filter_vector(resids, 'r', coord)
+        self.out_iterations[key] = data
+
+        cases = ([case for name, case in self.case_path] + [local_coord[0] for local_coord in coord[2::2]])[:MAX_DEPTH]
+        self.out_iterations.conn.execute('INSERT OR REPLACE INTO case_coordinates VALUES (?, ?, {})'.format(', '.join('?'*MAX_DEPTH)),
+                                         [key, len(cases)] + cases + [None]*(MAX_DEPTH - len(cases)))
+
+# 'MetricsRecorder' Recorder
+class MetricsRecorder(BaseRecorder):
+    """ Counts the iterations of the driver it is attached to and the time between them. Records no variables. Added with attach(),
+    it also totals the time spent in the driver's runs - the level's own time plus that of the levels nested in it. """
+
+    def __init__(self, metrics, level, total=None):
+        super(MetricsRecorder, self).__init__()
+
+        self.options['record_params'] = False
+        self.options['record_unknowns'] = False
+        self.options['record_resids'] = False
+        self.options['record_metadata'] = False
+
+        self.metrics = metrics
+        self.level = level
+        self.total = total  # total number of iterations expected at this level over the whole study, if known
+        self.completed = 0
+        self.seconds = None  # total seconds in the driver's runs - only known after attach()
+        self.latencies = deque(maxlen=metrics.window)  # rolling window of seconds between iterations
+        self._last = None
+
+    def attach(self, driver):
+        """ Adds this recorder to 'driver' and times each of its runs. """
+
+        driver.add_recorder(self)
+        run = driver.run
+        self.seconds = 0.0
+
+        def timed_run(problem):
+            start = time.time()
+            try:
+                return run(problem)
+            finally:
+                with self.metrics.lock:
+                    self.seconds += time.time() - start
+        driver.run = timed_run
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        now = time.time()
+        with self.metrics.lock:
+            self.completed += 1
+            if self._last is not None:
+                self.latencies.append(now - self._last)
+            self._last = now
+
+    def record_metadata(self, group):
+        pass
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+# 'P2Quantile' - streaming quantile estimate
+class P2Quantile(object):
+    """ Estimates one quantile of a stream in constant memory with the P-square algorithm (Jain & Chlamtac, 1985):
+    five markers whose heights are adjusted with a piecewise-parabolic fit as observations arrive. """
+
+    def __init__(self, p):
+        self.p = p
+        self.q = []  # marker heights
+        self.n = [0, 1, 2, 3, 4]  # actual marker positions
+        self.want = [0.0, 2*p, 4*p, 2+2*p, 4.0]  # desired marker positions
+        self.step = [0.0, p/2.0, p, (1+p)/2.0, 1.0]
+
+    def add(self, x):
+        q, n = self.q, self.n
+        if len(q) < 5:
+            q.append(x)
+            q.sort()
+            return
+
+        if x < q[0]:
+            q[0] = x
+            k = 0
+        elif x >= q[4]:
+            q[4] = x
+            k = 3
+        else:
+            k = max(i for i in range(4) if q[i] <= x)
+        for i in range(k+1, 5):
+            n[i] += 1
+        for i in range(5):
+            self.want[i] += self.step[i]
+
+        for i in (1, 2, 3):
+            d = self.want[i] - n[i]
+            if (d >= 1.0 and n[i+1] - n[i] > 1) or (d <= -1.0 and n[i-1] - n[i] < -1):
+                d = 1 if d > 0 else -1
+                h = q[i] + float(d)/(n[i+1] - n[i-1])*((n[i] - n[i-1] + d)*(q[i+1] - q[i])/(n[i+1] - n[i]) +
+                                                        (n[i+1] - n[i] - d)*(q[i] - q[i-1])/(n[i] - n[i-1]))
+                if not q[i-1] < h < q[i+1]:
+                    h = q[i] + d*(q[i+d] - q[i])/(n[i+d] - n[i])  # parabolic step overshot - fall back to linear
+                q[i] = h
+                n[i] += d
+
+    def value(self):
+        if not self.q:
+            return None
+        if len(self.q) < 5 or self.n[4] < 5:
+            return self.q[min(len(self.q)-1, int(len(self.q)*self.p))]
+        return self.q[2]
+
+# 'RunningStats' - streaming summary of one output
+class RunningStats(object):
+    """ Count, mean and variance (Welford's method), min, max and P-square quantile estimates of a stream of values, in constant
+    memory. NaN values - failed cases - are counted separately and left out of the statistics. """
+
+    def __init__(self, quantiles=()):
+        self.count = 0
+        self.failed = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+        self.min = float('inf')
+        self.max = float('-inf')
+        self.quantiles = [P2Quantile(p) for p in quantiles]
+
+    def add(self, x):
+        if x != x:  # NaN
+            self.failed += 1
+            return
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta/self.count
+        self._m2 += delta*(x - self.mean)
+        self.min = min(self.min, x)
+        self.max = max(self.max, x)
+        for quantile in self.quantiles:
+            quantile.add(x)
+
+    def summary(self):
+        summary = OrderedDict([('count', self.count), ('failed', self.failed)])
+        if self.count:
+            summary['mean'] = self.mean
+            summary['std'] = (self._m2/(self.count - 1))**0.5 if self.count > 1 else 0.0
+            summary['min'] = self.min
+            summary['max'] = self.max
+            for quantile in self.quantiles:
+                summary['p{:g}'.format(100*quantile.p)] = quantile.value()
+        return summary
+
+# 'SummaryRecorder' Recorder
+class SummaryRecorder(BaseRecorder):
+    """ Keeps running statistics of the chosen outputs of the driver it is attached to, over all its cases and per grid cell
+    (one cell per distinct value of the 'cells' variables), updated as each case completes. Writes them to a JSON file
+    when it is closed at cleanup(); summary() returns them at any time. A case recorded with success = 0 counts as failed for every
+    output. Memory depends on the number of cells, not of cases. """
+
+    def __init__(self, filename, outputs, cells=(), quantiles=(0.5, 0.9, 0.99)):
+        super(SummaryRecorder, self).__init__()
+
+        self.options['record_params'] = False
+        self.options['record_resids'] = False
+        self.options['record_metadata'] = False
+
+        self.filename = filename  # self.out stays None - BaseRecorder.close() would close it
+        self.outputs = list(outputs)
+        self.cells = list(cells)
+        self.stats = OrderedDict((name, RunningStats(quantiles)) for name in self.outputs)
+        self.cell_stats = OrderedDict()  # {cell: {output: RunningStats}}
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        cell = tuple(float(unknowns[name]) for name in self.cells)
+        if cell not in self.cell_stats:
+            self.cell_stats[cell] = OrderedDict((name, RunningStats()) for name in self.outputs)
+        failed = not metadata.get('success', 1)
+        for name in self.outputs:
+            value = np.nan if failed else float(unknowns[name])
+            self.stats[name].add(value)
+            self.cell_stats[cell][name].add(value)
+
+    def summary(self):
+        summary = OrderedDict([('outputs', OrderedDict((name, stats.summary()) for name, stats in self.stats.items()))])
+        if self.cells:
+            summary['cells'] = [OrderedDict([('cell', OrderedDict(zip(self.cells, cell)))] +
+                                            [(name, stats.summary()) for name, stats in cell_stats.items()])
+                                for cell, cell_stats in self.cell_stats.items()]
+        return summary
+
+    def record_metadata(self, group):
+        pass
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+    def close(self):
+        with open(self.filename, 'w') as f_out:
+            json.dump(self.summary(), f_out, indent=2)
+        super(SummaryRecorder, self).close()
+
+# 'StudyMetrics' - live progress of a running study
+class StudyMetrics(object):
+    """ Publishes per-level progress, throughput, latency percentiles and ETA of a running study as JSON
+    at http://127.0.0.1:<port>/ (e.g. `curl localhost:<port>`). port=0 picks any free port, so several studies can run at once;
+    serve=False only collects the metrics. """
+
+    def __init__(self, port=0, window=200, serve=True):
+        self.window = window
+        self.lock = threading.Lock()
+        self.levels = OrderedDict()
+        self.start = time.time()
+
+        metrics = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = json.dumps(metrics.snapshot(), indent=2).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass  # keep the study's own output readable
+
+        self.server = None
+        if serve:
+            self.server = HTTPServer(('127.0.0.1', port), Handler)
+            self.thread = threading.Thread(target=self.server.serve_forever)
+            self.thread.daemon = True
+            self.thread.start()
+            print('Study metrics at http://127.0.0.1:{}/'.format(self.server.server_port))
+
+    def recorder(self, level, total=None):
+        """ Returns a MetricsRecorder to add to the driver at nesting level 'level'. """
+        self.levels[level] = MetricsRecorder(self, level, total)
+        return self.levels[level]
+
+    def snapshot(self):
+        elapsed = time.time() - self.start
+        snapshot = OrderedDict([('elapsed', elapsed), ('levels', OrderedDict())])
+        with self.lock:
+            for level, rec in self.levels.items():
+                latencies = sorted(rec.latencies)
+                rate = rec.completed / elapsed if elapsed > 0.0 else 0.0
+                stats = OrderedDict([('completed', rec.completed), ('total', rec.total), ('per_sec', rate), ('seconds', rec.seconds)])
+                for p in (50, 90, 99):
+                    stats['latency_p{}'.format(p)] = latencies[min(len(latencies)-1, len(latencies)*p//100)] if latencies else None
+                if rec.total is not None:
+                    stats['eta'] = (rec.total - rec.completed) / rate if rate > 0.0 else None
+                snapshot['levels'][level] = stats
+        return snapshot
+
+    def shutdown(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+
+# 'DedupFullFactorialDriver' Driver
+class DedupFullFactorialDriver(FullFactorialDriver):
+    """ FullFactorialDriver that runs each distinct case only once. Cases are compared on their effective inputs - the design
+    variables whose values are read by some component, directly or through any depth of SubProblems. A case whose effective
+    inputs match an earlier case isn't run; it is recorded with the earlier case's results, success and its own design variable
+    values. Set dedupe=False when identical cases are meant to run again, e.g. in timing studies. Serial runs only. """
+
+    def __init__(self, num_levels=2, num_par_doe=1, load_balance=False, dedupe=True):
+        super(DedupFullFactorialDriver, self).__init__(num_levels=num_levels, num_par_doe=num_par_doe, load_balance=load_balance)
+
+        self.options.add_option('dedupe', dedupe, desc='Run cases with identical effective inputs only once')
+        self.duplicates = 0  # cases recorded without being run
+
+    def _reaches_consumer(self, root, name):
+        """ True if unknown 'name' of root's model is read by a component, or by anything inside a SubProblem it is passed to. """
+
+        source = root.unknowns.metadata(name)['pathname']
+        components = list(root.components(recurse=True))
+        for target, (src, idxs) in root._probdata.connections.items():
+            if src != source:
+                continue
+            comp = [comp for comp in components if target.startswith(comp.pathname + '.')][0]
+            if not isinstance(comp, SubProblem):
+                return True
+            inner = target[len(comp.pathname)+1:]  # SubProblem params are named after the inner Problem's variables
+            inner_problem = comp._problem
+            if inner in comp.unknowns or inner in inner_problem.driver._desvars or self._reaches_consumer(inner_problem.root, inner):
+                return True
+        return False
+
+    def run(self, problem):
+        if not self.options['dedupe'] or self._num_par_doe > 1:
+            return super(DedupFullFactorialDriver, self).run(problem)
+
+        effective = [name for name in self._desvars if self._reaches_consumer(self.root, name)]
+        results = {}  # {effective inputs: (case it was run in, unknowns, params, success)}
+        self.iter_count = 0
+        self.duplicates = 0
+        for run in self._build_runlist():
+            run = list(run)
+            key = tuple(tuple(np.atleast_1d(value).flat) for name, value in run if name in effective)
+
+            metadata = create_local_meta(None, 'Driver')
+            update_local_meta(metadata, (self.iter_count,))
+            if key in results:
+                case, unknowns, params, success = results[key]
+                self.root.unknowns.vec[:] = unknowns
+                self.root.params.vec[:] = params
+                for name, value in run:
+                    self.set_desvar(name, value)
+                self.root._transfer_data()
+                metadata['success'] = success
+                metadata['msg'] = 'Results of case {}'.format(case)
+                self.duplicates += 1
+            else:
+                for name, value in run:
+                    self.set_desvar(name, value)
+                with self.root._dircontext:
+                    terminate, exc = self._try_case(self.root, metadata)  # a failed analysis is recorded with success = 0
+                if exc is not None:
+                    six.reraise(*exc)
+                results[key] = (self.iter_count, self.root.unknowns.vec.copy(), self.root.params.vec.copy(), metadata['success'])
+
+            self.recorders.record_iteration(self.root, metadata)
+            self.iter_count += 1
+
             
+# Pre-flight cost estimate - `python optimization_initialcondition_profiling_repeat_v1.py --dry-run [--workers=N]`
+def driver_runs(driver):
+    """ Worst-case number of model evaluations in one run of a driver. """
+
+    num_desvars = sum(meta['size'] for meta in driver._desvars.values())
+    if isinstance(driver, FullFactorialDriver):
+        return driver.num_levels**num_desvars
+    if isinstance(driver, ScipyOptimizer):
+        if driver.options['optimizer'] == 'COBYLA':
+            return driver.options['maxiter']  # COBYLA's maxiter caps function evaluations
+        return driver.options['maxiter']*(1 + num_desvars)  # one evaluation plus a finite difference gradient per iteration
+    return 1  # a plain Driver runs the model once
+
+def estimate_cost(problem, level, history=None, workers=1):
+    """ Walks a set-up Problem and every SubProblem in it, and returns one row per nesting level with the worst-case and expected
+    number of model evaluations over the whole study, and the bytes of the model vectors (params, unknowns and resids) that level
+    holds on every worker - not the process's whole memory, see MemoryProfile for that.
+    'history' is a StudyMetrics snapshot of an earlier run of the same study; with it, expected counts come from the evaluations
+    each level actually needed per run of its parent, and 'seconds' predicts the time each level takes on 'workers' workers. A level's
+    time is its own: the time in its driver's runs minus the time in the runs of the levels nested in it, so the rows add up to the
+    whole study. """
+
+    levels = (history or {}).get('levels', {})
+    rows = []
+
+    def walk(problem, level, parent_worst, parent_expected, parent_completed):
+        worst = driver_runs(problem.driver)
+        seen = levels.get(level)
+        expected = float(seen['completed'])/parent_completed if seen and parent_completed else worst
+        root = problem.root
+        row = OrderedDict([('level', level), ('driver', type(problem.driver).__name__),
+                           ('worst', parent_worst*worst), ('expected', parent_expected*expected),
+                           ('vector_bytes', root.unknowns.vec.nbytes + root.params.vec.nbytes + root.resids.vec.nbytes),
+                           ('seconds', None)])
+        rows.append(row)
+
+        children = [walk(comp._problem, comp.name, row['worst'], row['expected'], seen['completed'] if seen else None)
+                    for comp in root.components(recurse=True) if isinstance(comp, SubProblem)]
+
+        # Own seconds per evaluation in the earlier run, scaled to this study's expected evaluations
+        if seen and seen.get('seconds') is not None and seen['completed'] and all(child is not None for child in children):
+            own = max(seen['seconds'] - sum(children), 0.0)
+            row['seconds'] = row['expected']*own/seen['completed']/workers
+        return seen.get('seconds') if seen else None
+
+    walk(problem, level, 1, 1, 1)
+    return rows
+
+def print_cost(rows, workers=1):
+    print('{:<28}{:<26}{:>14}{:>14}{:>12}{:>16}'.format('level', 'driver', 'worst case', 'expected', 'own seconds', 'vector memory'))
+    for row in rows:
+        seconds = '{:.1f}'.format(row['seconds']) if row['seconds'] is not None else '-'
+        print('{:<28}{:<26}{:>14,d}{:>14,.0f}{:>12}{:>16}'.format(row['level'], row['driver'], row['worst'], row['expected'], seconds,
+                                                                  '{:.1f} kB'.format(row['vector_bytes']/1024.0)))
+    if all(row['seconds'] is not None for row in rows):
+        print('Predicted time on {} worker(s): {:.1f} s'.format(workers, sum(row['seconds'] for row in rows)))
+    print('Model vectors on {} worker(s): {:.1f} kB - run with --memory for the whole process'.format(
+        workers, workers*sum(row['vector_bytes'] for row in rows)/1024.0))
+
+# Memory profile of a nested study - `python optimization_initialcondition_profiling_repeat_v1.py --memory`
+class MemoryProfile(object):
+    """ Records Python heap (tracemalloc) and process RSS around the setup, first iteration and cleanup of every Problem in a nested
+    study, attributed to the Problem's nesting path, plus the top allocation sites of each of those steps. A Problem's figures include
+    the Problems nested in it, whose setup, first iteration and cleanup run inside its own. After setup, vector_bytes_by_type() sizes
+    each level's model vectors by Component type - only the vectors, not the rest of the heap. Without tracemalloc (Python 2) only RSS
+    is recorded. """
+
+    def __init__(self, top_sites=5):
+        self.top_sites = top_sites
+        self.events = []  # one OrderedDict per (path, event)
+        self.problems = OrderedDict()  # {path: Problem}
+        self._open = []  # highest heap peak seen by each measurement in progress, outermost first
+        if tracemalloc is not None and not tracemalloc.is_tracing():
+            tracemalloc.start()
+
+    @staticmethod
+    def rss():
+        """ (current RSS, peak RSS) of this process in bytes, None where the platform doesn't tell us. """
+        current = peak = None
+        try:
+            with open('/proc/self/statm') as f_in:
+                current = int(f_in.read().split()[1])*resource.getpagesize()
+        except (IOError, OSError, AttributeError):
+            pass
+        if resource is not None:
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            peak *= 1 if sys.platform == 'darwin' else 1024  # kB on Linux, bytes on macOS
+        return current, peak
+
+    def _measure(self, path, event, func, *args, **kwargs):
+        before = tracemalloc.take_snapshot() if tracemalloc is not None else None
+        heap_before = tracemalloc.get_traced_memory()[0] if tracemalloc is not None else None
+        if hasattr(tracemalloc, 'reset_peak'):
+            # Resetting wipes the peak of the measurements this one is nested in, so hand it to them first
+            heap_peak = tracemalloc.get_traced_memory()[1]
+            self._open = [max(peak, heap_peak) for peak in self._open]
+            tracemalloc.reset_peak()
+        self._open.append(0)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            record = OrderedDict([('path', path), ('event', event)])
+            peak = self._open.pop()
+            if tracemalloc is not None:
+                heap, heap_peak = tracemalloc.get_traced_memory()
+                record['heap_delta'] = heap - heap_before
+                record['heap_peak'] = max(peak, heap_peak) - heap_before  # above the heap at the start
+                stats = tracemalloc.take_snapshot().compare_to(before, 'filename')
+                record['top_sites'] = [(str(stat.traceback), stat.size_diff) for stat in stats[:self.top_sites]]
+            record['rss'], record['peak_rss'] = self.rss()
+            self.events.append(record)
+
+    @staticmethod
+    def _subproblems(group, prefix):
+        """ (path, SubProblem) of every SubProblem in 'group', with paths built from the systems' names - pathnames are only set at setup. """
+        for sub in group.subsystems():
+            if isinstance(sub, SubProblem):
+                yield prefix + sub.name, sub
+            elif isinstance(sub, Group):
+                for path, subproblem in MemoryProfile._subproblems(sub, prefix + sub.name + '.'):
+                    yield path, subproblem
+
+    def instrument(self, problem, path):
+        """ Hooks the setup, first iteration and cleanup of 'problem' and of every Problem nested in it through SubProblems. Call it
+        before setup. The hooks wrap whatever they find and never put back an earlier method, so wrappers added later - such as
+        GuardedSubProblem's budget - stay in place. """
+
+        self.problems[path] = problem
+        profile = self
+
+        setup, cleanup = problem.setup, problem.cleanup
+        problem.setup = lambda *args, **kwargs: profile._measure(path, 'setup', setup, *args, **kwargs)
+        problem.cleanup = lambda *args, **kwargs: profile._measure(path, 'cleanup', cleanup, *args, **kwargs)
+
+        root = problem.root
+        solve_nonlinear = root.solve_nonlinear
+        measured = []
+        def first_solve_nonlinear(*args, **kwargs):
+            if measured:  # measure the first iteration only
+                return solve_nonlinear(*args, **kwargs)
+            measured.append(True)
+            return profile._measure(path, 'first iteration', solve_nonlinear, *args, **kwargs)
+        root.solve_nonlinear = first_solve_nonlinear
+
+        for sub_path, sub in self._subproblems(root, path + '.'):
+            self.instrument(sub._problem, sub_path)
+
+    def vector_bytes_by_type(self):
+        """ {path: {Component type: bytes of its params and unknowns vectors}} - call after setup. """
+        levels = OrderedDict()
+        for path, problem in self.problems.items():
+            types = levels[path] = OrderedDict()
+            for comp in problem.root.components(recurse=True):
+                size = sum(getattr(acc.val, 'nbytes', 0) for vec in (comp.params, comp.unknowns) for acc in vec._dat.values())
+                types[type(comp).__name__] = types.get(type(comp).__name__, 0) + size
+        return levels
+
+    @staticmethod
+    def size(size):
+        """ 'size' bytes in B, kB or MB, whichever reads best. """
+        if size is None:
+            return '-'
+        if abs(size) < 1024:
+            return '{:d} B'.format(int(size))
+        if abs(size) < 1024**2:
+            return '{:.1f} kB'.format(size/1024.0)
+        return '{:.1f} MB'.format(size/1024.0**2)
+
+    def report(self, filename='memory_profile.json'):
+        kB = self.size
+        line = '{:<' + str(max([len(path) for path in self.problems] + [7]) + 2) + '}{:<18}{:>14}{:>14}{:>14}'
+        print(line.format('problem', 'event', 'heap delta', 'heap peak', 'peak RSS'))
+        for record in self.events:
+            print(line.format(record['path'], record['event'], kB(record.get('heap_delta')), kB(record.get('heap_peak')),
+                              kB(record['peak_rss'])))
+        print('Each row includes the Problems nested in that one; heap peak is above the heap at the start of the step.')
+        types = self.vector_bytes_by_type()
+        print('Model vectors by Component type (the vectors only - see the top allocation sites in {} for the rest):'.format(filename))
+        for path, sizes in types.items():
+            print('{}: {}'.format(path, ', '.join('{} {}'.format(name, kB(size)) for name, size in sizes.items())))
+
+        # Worker sizing: every parallel worker holds a copy of the whole tree, so its footprint is about this process's peak RSS
+        peak_rss = max([record['peak_rss'] for record in self.events if record['peak_rss'] is not None] or [None])
+        try:
+            available = os.sysconf('SC_AVPHYS_PAGES')*os.sysconf('SC_PAGE_SIZE')
+        except (ValueError, OSError, AttributeError):
+            available = None
+        if peak_rss and available:
+            print('Peak RSS per worker {} - about {} workers fit in the {} available'.format(kB(peak_rss), available//peak_rss, kB(available)))
+
+        with open(filename, 'w') as f_out:
+            json.dump(OrderedDict([('events', self.events), ('vector_bytes_by_type', types), ('peak_rss', peak_rss)]), f_out, indent=2)
+
 if __name__ == '__main__':
 
+    # A dry run only sets the study up and estimates its cost - no recorder is built, so no earlier results are overwritten
+    dry_run = '--dry-run' in sys.argv
+    
+    # The 10 repeats are identical cases (see below). --dedupe runs them once, for the results rather than the timings.
+    dedupe = '--dedupe' in sys.argv
+    
+    # Live progress of the study: `curl localhost:<port>` while it runs, with the port printed at startup. A dry run only reads metrics.
+    metrics = StudyMetrics(serve=not dry_run)
+    
     # Instantiate a sub-level Problem 'OptimizationProblem'.
     # Instantiate a Group and add it to OptimizationProblem.
     optimizationProblem = Problem()
@@ -123,6 +917,14 @@ if __name__ == '__main__':
     optimizationProblem.driver.add_desvar('p1.x', lower=-50, upper=50)
     optimizationProblem.driver.add_desvar('p2.y', lower=-50, upper=50)
     optimizationProblem.driver.add_objective('Paraboloid.f_xy')
+    metrics.recorder('OptimizationProblem').attach(optimizationProblem.driver)  # inner evaluations/sec
+    
+    # Record only the converged point of each inner optimization, not every COBYLA iteration
+    if not dry_run:
+        inner_recorder = PolicySqliteRecorder('record_results_optimization_problem')
+        inner_recorder.options['record_final_only'] = True
+        inner_recorder.options['includes'] = ['p1.x', 'p2.y', 'Paraboloid.f_xy']
+        inner_recorder.attach(optimizationProblem.driver)
     
     
     # Instantiate a mid-level Problem 'OptimizationProfiler'
@@ -137,8 +939,10 @@ if __name__ == '__main__':
     
     # Add optimizationProblem to OptimizationProfiler as a SubProblem called 'OptimizationProblem' 
     # Include optimizationProblem's Problem Inputs and Problem Outputs in 'params' and 'unknowns' fields of SubProblem 
-    OptimizationProfiler.root.add('OptimizationProblem', SubProblem(optimizationProblem, params=['p1.x', 'p2.y'],
-                                            unknowns=['output1.x_f', 'output2.y_f', 'Paraboloid.f_xy']))  # This is where you designate what to expose to the outside world
+    # An initial condition whose optimization runs past 5 s or 1000 evaluations is recorded as NaN instead of holding up the study
+    OptimizationProfiler.root.add('OptimizationProblem', GuardedSubProblem(optimizationProblem, params=['p1.x', 'p2.y'],
+                                            unknowns=['output1.x_f', 'output2.y_f', 'Paraboloid.f_xy'],  # This is where you designate what to expose to the outside world
+                                            max_time=5.0, max_evals=1000))
     
     # Add the 'SaveTime' and 'MeasureTime' Components to OptimizationProfiler's root Group.
     OptimizationProfiler.root.add('SaveTime', SaveTime())
@@ -160,6 +964,13 @@ if __name__ == '__main__':
     OptimizationProfiler.driver.add_objective('OptimizationProblem.Paraboloid.f_xy')
     OptimizationProfiler.driver.add_objective('OptimizationProblem.output1.x_f')
     OptimizationProfiler.driver.add_objective('OptimizationProblem.output2.y_f')
+    metrics.recorder('OptimizationProfiler', total=(1 if dedupe else 10)*11**2).attach(OptimizationProfiler.driver)  # 11^2 cases per repeat run
+    
+    # Solve time and final point per initial condition, over all 10 repeats - written to summary.json at cleanup()
+    if not dry_run:
+        OptimizationProfiler.driver.add_recorder(SummaryRecorder('summary.json', cells=['p1.x_0', 'p2.y_0'],
+                                                outputs=['MeasureTime.time', 'OptimizationProblem.Paraboloid.f_xy',
+                                                    'OptimizationProblem.output1.x_f', 'OptimizationProblem.output2.y_f']))
     
     
     # Instantiate a top-level Problem 'OptimizationProfilerRepeat'
@@ -172,16 +983,21 @@ if __name__ == '__main__':
     
     # Add OptimizationProfiler to OptimizationProfilerRepeat as a SubProblem called 'OptimizationProfiler' 
     # Include OptimizationProfiler's Problem Inputs and Problem Outputs in 'params' and 'unknowns' fields of SubProblem 
-    OptimizationProfilerRepeat.root.add('OptimizationProfiler', SubProblem(OptimizationProfiler, params=['p3.n'],
+    # A repeat that runs past 10 minutes is recorded as NaN and the next repeat starts
+    OptimizationProfilerRepeat.root.add('OptimizationProfiler', GuardedSubProblem(OptimizationProfiler, params=['p3.n'],
                                             unknowns=['OptimizationProblem.output1.x_f', 'OptimizationProblem.output2.y_f', \
-                                                'OptimizationProblem.Paraboloid.f_xy', 'MeasureTime.time']))  # This is where you designate what to expose to the outside world
+                                                'OptimizationProblem.Paraboloid.f_xy', 'MeasureTime.time'],  # This is where you designate what to expose to the outside world
+                                            max_time=600.0))
    
     # Connections
     OptimizationProfilerRepeat.root.connect('p1.n', 'OptimizationProfiler.p3.n')  # note that OptimizationProfiler.p3.n isn't connected to anything inside OptimizationProfiler
     # ^ You can comment out the line above and it works the same.
     
     # Add driver
-    OptimizationProfilerRepeat.driver = FullFactorialDriver(num_levels=10)  # generate 10 profiler samples
+    # p1.n reaches nothing inside OptimizationProfiler, so all 10 cases are identical - but repeating them is the point of this
+    # timing study, so deduplication is only turned on with --dedupe: OptimizationProfiler then runs once and its results are
+    # recorded for all 10 cases
+    OptimizationProfilerRepeat.driver = DedupFullFactorialDriver(num_levels=10, dedupe=dedupe)  # generate 10 profiler samples
     OptimizationProfilerRepeat.driver.add_desvar('p1.n', lower=0.0, upper=10.0)
     OptimizationProfilerRepeat.driver.add_objective('OptimizationProfiler.MeasureTime.time')
     OptimizationProfilerRepeat.driver.add_objective('OptimizationProfiler.OptimizationProblem.Paraboloid.f_xy')
@@ -189,21 +1005,50 @@ if __name__ == '__main__':
     OptimizationProfilerRepeat.driver.add_objective('OptimizationProfiler.OptimizationProblem.output2.y_f')
     
     # Data collection
-    recorder = SqliteRecorder('record_results')
-    recorder.options['record_params'] = True
-    recorder.options['record_metadata'] = True
-    OptimizationProfilerRepeat.driver.add_recorder(recorder)
+    if not dry_run:
+        recorder = PolicySqliteRecorder('record_results')
+        recorder.options['record_params'] = True
+        recorder.options['record_metadata'] = True
+        recorder.options['record_every'] = 1  # every repeat is a sample we analyse
+        OptimizationProfilerRepeat.driver.add_recorder(recorder)
+    metrics.recorder('OptimizationProfilerRepeat', total=10).attach(OptimizationProfilerRepeat.driver)
+    
+    # Memory profile - every Problem's setup, first iteration and cleanup, written to memory_profile.json
+    memory = MemoryProfile() if '--memory' in sys.argv else None
+    if memory is not None:
+        memory.instrument(OptimizationProfilerRepeat, 'OptimizationProfilerRepeat')
     
     # Setup
     OptimizationProfilerRepeat.setup(check=False)
     
+    # Dry run - report how much work the study implies, using metrics.json from the last full run if there is one
+    if dry_run:
+        workers = int(([arg.split('=')[1] for arg in sys.argv if arg.startswith('--workers=')] or [1])[0])
+        history = json.load(open('metrics.json')) if os.path.exists('metrics.json') else None
+        print_cost(estimate_cost(OptimizationProfilerRepeat, 'OptimizationProfilerRepeat', history, workers), workers)
+        metrics.shutdown()
+        sys.exit(0)
+    
     # Run 
     OptimizationProfilerRepeat.run()
+    if dedupe:
+        print('{} of 10 repeats were duplicates - recorded without being run'.format(OptimizationProfilerRepeat.driver.duplicates))
     
     # Cleanup
     OptimizationProfilerRepeat.cleanup()
+    with open('metrics.json', 'w') as f_out:
+        json.dump(metrics.snapshot(), f_out, indent=2)  # history for the next --dry-run
+    metrics.shutdown()
+    if memory is not None:
+        memory.report()
     
     # Data retrieval & display
+    # The converged inner optimization for initial condition 7 of repeat 3 - found by its case coordinates, without a scan
+    inner_db = sqlitedict.SqliteDict( 'record_results_optimization_problem', 'iterations' )
+    for key in find_cases('record_results_optimization_problem', 3, 7):
+        print(key, inner_db[key]['Unknowns'])
+    inner_db.close()
+    
     # Old way - good for debugging IndepVars
     db = sqlitedict.SqliteDict( 'record_results', 'iterations' )
     db_keys = list( db.keys() ) # list() needed for compatibility with Python 3. Not needed for Python 2
@@ -21,9 +21,12 @@ from openmdao.api import FullFactorialDriver  # FullFactorialDriver driver
 from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
 from openmdao.api import SubProblem  # Allows for nested drivers - not currently supported in OpenMETA - Introduced in OpenMDAO v.1.7.2.
 from openmdao.api import SqliteRecorder  # Recorder
+from openmdao.util.record_util import format_iteration_coordinate
 import sqlitedict
+import sqlite3
 import random
 import time
+import os
 from pprint import pprint
 
 # 'Paraboloid' Component
@@ -81,7 +84,139 @@ class MeasureTime(Component):
         except IOError:
             unknowns['time'] = -1.0
 
+# 'CostOrderedFullFactorialDriver' Driver
+class CostOrderedFullFactorialDriver(FullFactorialDriver):
+    """ FullFactorialDriver that dispatches the most expensive cases first, using a per-case cost model. """
+
+    def __init__(self, num_levels=2, num_par_doe=1, load_balance=True, cost='MeasureTime.time'):
+        super(CostOrderedFullFactorialDriver, self).__init__(num_levels=num_levels, num_par_doe=num_par_doe,
+                                                             load_balance=load_balance)
+
+        self.cost = cost  # unknown that measures how long a case took
+        self._costs = {}  # {(desvar values): observed cost}
+
+    def load_costs(self, filename):
+        """ Seeds the cost model with the desvars and cost recorded by a previous run's SqliteRecorder. """
+
+        if not os.path.exists(filename):
+            return
+
+        db = sqlitedict.SqliteDict(filename, 'iterations', flag='r')
+        for data in db.values():
+            unknowns = data['Unknowns']
+            names = list(self._desvars.keys())
+            if self.cost in unknowns and all(name in unknowns for name in names) and unknowns[self.cost] >= 0.0:
+                self._costs[tuple(float(unknowns[name]) for name in names)] = float(unknowns[self.cost])
+        db.close()
+
+    def _predict_cost(self, run):
+        """ Expected cost of a case: its own recorded cost, or else the cost of the nearest recorded case. """
+
+        key = tuple(float(val) for name, val in run)
+        if key in self._costs:
+            return self._costs[key]
+        if not self._costs:
+            return 0.0
+        nearest = min(self._costs, key=lambda k: sum((a-b)**2 for a, b in zip(k, key)))
+        return self._costs[nearest]
+
+    def _build_runlist(self):
+        """ Yields the full factorial cases longest-first. When running serially, the costs of
+        completed cases are fed back into the model and the remaining cases are re-ranked. """
+
+        names = list(self._desvars.keys())
+        pending = [sorted(run, key=lambda item: names.index(item[0]))
+                   for run in super(CostOrderedFullFactorialDriver, self)._build_runlist()]
+        pending.sort(key=self._predict_cost, reverse=True)
+
+        observed = 0
+        while pending:
+            run = pending.pop(0)
+            yield run
+
+            # Only a serial run evaluates the case on this process, so only then is the cost available here
+            if self._num_par_doe == 1:
+                self._costs[tuple(float(val) for name, val in run)] = float(self.root.unknowns[self.cost])
+                observed += 1
+                if observed & (observed - 1) == 0:  # re-rank after 1, 2, 4, 8, ... completed cases
+                    pending.sort(key=self._predict_cost, reverse=True)
+
             
+# 'IndexedSqliteRecorder' Recorder
+class IndexedSqliteRecorder(SqliteRecorder):
+    """ SqliteRecorder that also writes the value of every recorded scalar unknown (or only options['indexed']) to an indexed
+    'case_index' table in the same file, so CaseIndex can find the best or worst cases without unpickling every iteration. """
+
+    def __init__(self, out, **sqlite_dict_args):
+        super(IndexedSqliteRecorder, self).__init__(out, **sqlite_dict_args)
+
+        self.options.add_option('indexed', [], desc='Unknowns to index. Default: every recorded scalar unknown')
+
+        if hasattr(self, 'out_iterations'):  # only the process that writes the file keeps the index
+            conn = self.out_iterations.conn
+            conn.execute('DROP TABLE IF EXISTS case_index')
+            conn.execute('CREATE TABLE case_index (name TEXT, value REAL, key TEXT)')
+            conn.execute('CREATE INDEX case_index_name_value ON case_index (name, value)')
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        super(IndexedSqliteRecorder, self).record_iteration(params, unknowns, resids, metadata)
+
+        if not hasattr(self, 'out_iterations'):
+            return
+        key = format_iteration_coordinate(metadata['coord'])  # same key SqliteRecorder stores the iteration under
+        for name in self.options['indexed'] or unknowns.keys():
+            try:
+                value = float(unknowns[name])
+            except (TypeError, ValueError):
+                continue  # arrays and pass-by-object variables aren't indexed
+            self.out_iterations.conn.execute('INSERT INTO case_index (name, value, key) VALUES (?, ?, ?)', (name, value, key))
+
+# 'CaseIndex'
+class CaseIndex(object):
+    """ Top-k, range and filter queries over the case_index table written by IndexedSqliteRecorder.
+    Queries return (key, value) pairs in value order; cases() unpickles only the iterations asked for. """
+
+    def __init__(self, filename):
+        self._conn = sqlite3.connect(filename)
+        self._db = sqlitedict.SqliteDict(filename, 'iterations', flag='r')
+
+    def top_k(self, name, k, largest=False):
+        """ The k cases with the smallest (or largest) value of name. """
+        order = 'DESC' if largest else 'ASC'
+        return self._conn.execute('SELECT key, value FROM case_index WHERE name = ? AND value IS NOT NULL ORDER BY value {} LIMIT ?'.format(order),
+                                  (name, k)).fetchall()
+
+    def between(self, name, lower=None, upper=None):
+        """ Every case with lower <= value of name <= upper. Either bound may be None. """
+        lower = float('-inf') if lower is None else lower
+        upper = float('inf') if upper is None else upper
+        return self._conn.execute('SELECT key, value FROM case_index WHERE name = ? AND value BETWEEN ? AND ? ORDER BY value',
+                                  (name, lower, upper)).fetchall()
+
+    def percentile(self, name, q):
+        """ The value of name at the q-th percentile (0 - 100) of the recorded cases. """
+        count = self._conn.execute('SELECT COUNT(*) FROM case_index WHERE name = ? AND value IS NOT NULL', (name,)).fetchone()[0]
+        row = self._conn.execute('SELECT value FROM case_index WHERE name = ? AND value IS NOT NULL ORDER BY value LIMIT 1 OFFSET ?',
+                                 (name, min(int(count*q/100.0), count-1))).fetchone()
+        return row[0] if row else None
+
+    def where(self, **ranges):
+        """ Keys of the cases that satisfy every range at once, e.g. where(**{'MeasureTime.time': (0.5, None)}). """
+        keys = None
+        for name, (lower, upper) in ranges.items():
+            matched = set(key for key, value in self.between(name, lower, upper))
+            keys = matched if keys is None else keys & matched
+        return sorted(keys or [])
+
+    def cases(self, keys):
+        """ Yields (key, recorded iteration) for the given keys only. """
+        for key in keys:
+            yield key, self._db[key]
+
+    def close(self):
+        self._conn.close()
+        self._db.close()
+
 if __name__ == '__main__':
 
     # Instantiate a sub-level Problem 'OptimizationProblem'.
@@ -150,7 +285,9 @@ if __name__ == '__main__':
     OptimizationProfiler.root.connect('OptimizationProblem.Paraboloid.f_xy', 'MeasureTime.finished')
     
     # Add driver
-    OptimizationProfiler.driver = FullFactorialDriver(num_levels=11)
+    # Inner COBYLA runtimes depend strongly on the initial condition, so cases are dispatched longest-first.
+    # With num_par_doe > 1 (under MPI), load_balance hands each case to whichever worker is free next.
+    OptimizationProfiler.driver = CostOrderedFullFactorialDriver(num_levels=11, cost='MeasureTime.time')
     
     # Add design variables and objectives to the parameter study driver
     OptimizationProfiler.driver.add_desvar('p1.x_0', lower=-50, upper=50)
@@ -160,11 +297,15 @@ if __name__ == '__main__':
     OptimizationProfiler.driver.add_objective('OptimizationProblem.output1.x_f')
     OptimizationProfiler.driver.add_objective('OptimizationProblem.output2.y_f')
     
+    # Seed the case cost model with the timings recorded by the previous run (before setup() overwrites 'record_results')
+    OptimizationProfiler.driver.load_costs('record_results')
+    
     
     # Data collection
-    recorder = SqliteRecorder('record_results')
+    recorder = IndexedSqliteRecorder('record_results')
     recorder.options['record_params'] = True
     recorder.options['record_metadata'] = True
+    recorder.options['indexed'] = ['MeasureTime.time', 'OptimizationProblem.Paraboloid.f_xy']  # what we query after the study
     OptimizationProfiler.driver.add_recorder(recorder)
     
     # Setup
@@ -177,6 +318,16 @@ if __name__ == '__main__':
     OptimizationProfiler.cleanup()
     
     # Data retrieval & display
+    # Indexed queries - only the matching iterations are unpickled
+    index = CaseIndex('record_results')
+    print('Best 5 cases:')
+    for key, data in index.cases(key for key, value in index.top_k('OptimizationProblem.Paraboloid.f_xy', 5)):
+        print(key, data['Unknowns']['p1.x_0'], data['Unknowns']['p2.y_0'], data['Unknowns']['OptimizationProblem.Paraboloid.f_xy'])
+    print('Cases slower than the 90th percentile:')
+    for key, value in index.between('MeasureTime.time', lower=index.percentile('MeasureTime.time', 90)):
+        print(key, value)
+    index.close()
+    
     # Old way - good for debugging IndepVars
     db = sqlitedict.SqliteDict( 'record_results', 'iterations' )
     db_keys = list( db.keys() ) # list() needed for compatibility with Python 3. Not needed for Python 2
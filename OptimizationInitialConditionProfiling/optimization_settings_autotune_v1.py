@@ -0,0 +1,237 @@
+'''
+# Name: optimization_settings_autotune_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Picks the Optimizer settings for 'OptimizationProblem' by running the initial condition profiling study once per candidate
+#           configuration, within a budget, and keeping the cheapest configuration that still reaches the objective to a set accuracy
+#           from every initial condition.
+#           Adaption of OpenMDAO tutorial: http://openmdao.readthedocs.io/en/1.7.3/usr-guide/tutorials/paraboloid-tutorial.html
+
+# Inputs: --target= accuracy required on the objective (default 1e-3), --budget= number of configurations to try (default 20),
+#         --metric= 'evals' or 'time', what to minimize (default 'evals')
+
+# Outputs: optimizer_settings.json - the chosen configuration
+'''
+
+from __future__ import print_function
+from openmdao.api import IndepVarComp, Component, Problem, Group
+from openmdao.api import ScipyOptimizer  # Optimizer driver
+from openmdao.api import FullFactorialDriver  # FullFactorialDriver driver
+from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
+from openmdao.api import SubProblem  # Allows for nested drivers - not currently supported in OpenMETA - Introduced in OpenMDAO v.1.7.2.
+from openmdao.recorders.base_recorder import BaseRecorder
+from collections import OrderedDict
+from itertools import product
+import random
+import time
+import sys
+import json
+from pprint import pprint
+
+# 'Paraboloid' Component
+class Paraboloid(Component):
+    ''' Evaluates the equation f(x,y) = (x-3)^2 +xy +(y+4)^2 - 3 '''
+
+    def __init__(self):
+        super(Paraboloid, self).__init__()
+
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=0.0)
+
+        self.add_output('f_xy', shape=1)
+
+        self.evals = 0  # evaluations so far - the cost the tuner minimizes
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        ''' f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3 '''
+
+        x = params['x']
+        y = params['y']
+
+        unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+        self.evals += 1
+
+# 'SaveTime' Component
+class SaveTime(Component):
+    """ Saves the current time to time.txt """
+
+    def __init__(self):
+        super(SaveTime, self).__init__()
+
+        self.add_param('pass_in', val=0.0)
+        self.add_output('pass_out', val=0.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+
+        unknowns['pass_out'] = params['pass_in']
+
+        with open('time.txt', 'w') as f_out:
+            f_out.write("{:.3f}\n".format(time.time()))
+
+# 'MeasureTime Component
+class MeasureTime(Component):
+    """ Calculates the elapsed time since the time in time.txt. """
+
+    def __init__(self):
+        super(MeasureTime, self).__init__()
+
+        self.add_param('finished', val=0.0)
+        self.add_output('time', val=0.0)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+
+        try:
+            with open('time.txt', 'r') as f_in:
+                unknowns['time'] = time.time()-float(f_in.readline())
+        except IOError:
+            unknowns['time'] = -1.0
+
+# 'CaseCollector' Recorder
+class CaseCollector(BaseRecorder):
+    """ Keeps the chosen unknowns of every iteration in memory, in iteration order. """
+
+    def __init__(self, names):
+        super(CaseCollector, self).__init__()
+
+        self.options['record_params'] = False
+        self.options['record_resids'] = False
+        self.options['record_metadata'] = False
+
+        self.names = names
+        self.cases = []
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        self.cases.append([float(unknowns[name]) for name in self.names])
+
+    def record_metadata(self, group):
+        pass
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+# Settings the tuner may choose from, per optimizer. 'tol' and 'maxiter' are ScipyOptimizer options; the rest are opt_settings.
+SEARCH_SPACE = OrderedDict([
+    ('COBYLA', OrderedDict([('tol', [1.0e-2, 1.0e-3, 1.0e-4, 1.0e-6]),
+                            ('maxiter', [50, 100, 200]),
+                            ('rhobeg', [0.5, 1.0, 5.0, 10.0]),      # Initial step size
+                            ('catol', [2.0e-4, 1.0e-3])])),         # Tolerance on constraint violations
+    ('SLSQP', OrderedDict([('tol', [1.0e-3, 1.0e-4, 1.0e-6]),
+                           ('maxiter', [50, 100, 200])])),
+])
+DRIVER_OPTIONS = ('tol', 'maxiter')
+
+# Settings the Problem's root Group needs for each optimizer. Paraboloid has no derivatives, so the gradient-based optimizers need them
+# finite differenced - these go into every configuration the tuner emits, so the printed settings work when pasted into a PET.
+DERIV_OPTIONS = {
+    'SLSQP': OrderedDict([('type', 'fd')]),
+}
+
+def configurations(budget, seed=0):
+    """ Every combination in SEARCH_SPACE, or a random 'budget' of them if there are more. """
+
+    grid = []
+    for optimizer, space in SEARCH_SPACE.items():
+        for values in product(*space.values()):
+            config = OrderedDict([('optimizer', optimizer)] + list(zip(space.keys(), values)))
+            if optimizer in DERIV_OPTIONS:
+                config['deriv_options'] = DERIV_OPTIONS[optimizer]
+            grid.append(config)
+    return grid if len(grid) <= budget else random.Random(seed).sample(grid, budget)
+
+def profile(config, num_levels=5):
+    """ Runs the initial condition profiling study with the Optimizer configured by 'config'. Returns the total evaluations of
+    Paraboloid, the total optimization time, and the final objective from each initial condition. """
+
+    # Same 'OptimizationProblem' as optimization_initialcondition_profiling_v1.py, with the Optimizer settings under test
+    paraboloid = Paraboloid()
+    optimizationProblem = Problem()
+    optimizationProblem.root = Group()
+    optimizationProblem.root.add('Paraboloid', paraboloid)
+    optimizationProblem.root.add('p1', IndepVarComp('x', 0.0))
+    optimizationProblem.root.add('p2', IndepVarComp('y', 0.0))
+    optimizationProblem.root.connect('p1.x', 'Paraboloid.x')
+    optimizationProblem.root.connect('p2.y', 'Paraboloid.y')
+
+    optimizationProblem.driver = ScipyOptimizer()
+    for name, value in config.items():
+        if name == 'deriv_options':
+            for option, setting in value.items():
+                optimizationProblem.root.deriv_options[option] = setting
+        elif name == 'optimizer' or name in DRIVER_OPTIONS:
+            optimizationProblem.driver.options[name] = value
+        else:
+            optimizationProblem.driver.opt_settings[name] = value
+    optimizationProblem.driver.add_desvar('p1.x', lower=-50, upper=50)
+    optimizationProblem.driver.add_desvar('p2.y', lower=-50, upper=50)
+    optimizationProblem.driver.add_objective('Paraboloid.f_xy')
+
+    # Same 'OptimizationProfiler' as optimization_initialcondition_profiling_v1.py
+    OptimizationProfiler = Problem()
+    OptimizationProfiler.root = Group()
+    OptimizationProfiler.root.add('p1', IndepVarComp('x_0', 0.0))
+    OptimizationProfiler.root.add('p2', IndepVarComp('y_0', 0.0))
+    OptimizationProfiler.root.add('OptimizationProblem', SubProblem(optimizationProblem, params=['p1.x', 'p2.y'],
+                                            unknowns=['Paraboloid.f_xy']))
+    OptimizationProfiler.root.add('SaveTime', SaveTime())
+    OptimizationProfiler.root.add('MeasureTime', MeasureTime())
+    OptimizationProfiler.root.connect('p1.x_0', 'SaveTime.pass_in')
+    OptimizationProfiler.root.connect('p2.y_0', 'OptimizationProblem.p2.y')
+    OptimizationProfiler.root.connect('SaveTime.pass_out', 'OptimizationProblem.p1.x')
+    OptimizationProfiler.root.connect('OptimizationProblem.Paraboloid.f_xy', 'MeasureTime.finished')
+
+    OptimizationProfiler.driver = FullFactorialDriver(num_levels=num_levels)
+    OptimizationProfiler.driver.add_desvar('p1.x_0', lower=-50, upper=50)
+    OptimizationProfiler.driver.add_desvar('p2.y_0', lower=-50, upper=50)
+    collector = CaseCollector(['MeasureTime.time', 'OptimizationProblem.Paraboloid.f_xy'])
+    OptimizationProfiler.driver.add_recorder(collector)
+
+    OptimizationProfiler.setup(check=False)
+    OptimizationProfiler.run()
+    OptimizationProfiler.cleanup()
+
+    return paraboloid.evals, sum(case[0] for case in collector.cases), [case[1] for case in collector.cases]
+
+if __name__ == '__main__':
+
+    # e.g. `python optimization_settings_autotune_v1.py --target=1e-4 --budget=40 --metric=time`
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    target = float(options.get('target', 1.0e-3))  # every initial condition must end within this of the best objective found from it
+    budget = int(options.get('budget', 20))  # configurations to try
+    metric = options.get('metric', 'evals')  # 'evals' or 'time' - what to minimize
+    if metric not in ('evals', 'time'):
+        raise ValueError("--metric must be 'evals' or 'time', not {!r}".format(metric))
+
+    results = []
+    for config in configurations(budget):
+        evals, seconds, f_final = profile(config)
+        results.append(OrderedDict([('config', config), ('evals', evals), ('time', seconds), ('f_final', f_final)]))
+        print('{:<70} {:>7d} evaluations {:>8.3f} s'.format(json.dumps(config), evals, seconds))
+
+    # Accuracy: worst distance from the best objective any configuration reached from the same initial condition
+    f_best = [min(case) for case in zip(*[result['f_final'] for result in results])]
+    for result in results:
+        result['error'] = max(abs(f - best) for f, best in zip(result['f_final'], f_best))
+
+    accurate = [result for result in results if result['error'] <= target]
+    if not accurate:
+        print('No configuration reached the objective to within {} from every initial condition'.format(target))
+    else:
+        best = min(accurate, key=lambda result: result[metric])
+        print('\nBest configuration: {} - {} evaluations, {:.3f} s, error {:.2e}'.format(json.dumps(best['config']), best['evals'],
+                                                                                           best['time'], best['error']))
+
+        # Write the choice back for the PETs
+        with open('optimizer_settings.json', 'w') as f_out:
+            json.dump(best['config'], f_out, indent=2)
+        for name, value in best['config'].items():
+            if name == 'deriv_options':
+                for option, setting in value.items():
+                    print("optimizationProblem.root.deriv_options['{}'] = {!r}".format(option, setting))
+            elif name == 'optimizer' or name in DRIVER_OPTIONS:
+                print("optimizationProblem.driver.options['{}'] = {!r}".format(name, value))
+            else:
+                print("optimizationProblem.driver.opt_settings['{}'] = {!r}".format(name, value))
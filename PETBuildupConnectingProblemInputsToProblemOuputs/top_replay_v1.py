@@ -0,0 +1,263 @@
+'''
+# Name: top_replay_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Re-evaluates top_v1's Parameter Study from its recorded cases with a new post-processing Component 'Total' added,
+#           using the recorded results of SubProblem 'Sub' instead of re-running its optimizations. Run top_v1.py first.
+#           Adaption of OpenMDAO tutorial: http://openmdao.readthedocs.io/en/1.7.3/usr-guide/tutorials/paraboloid-tutorial.html
+
+# Inputs:
+
+# Outputs:
+'''
+
+from __future__ import print_function
+from openmdao.api import IndepVarComp, Component, Problem, Group
+from openmdao.api import ScipyOptimizer  # Optimizer driver
+from openmdao.api import SubProblem  # Allows for nested drivers - not currently supported in OpenMETA - Introduced in OpenMDAO v.1.7.2.
+from openmdao.api import FullFactorialDriver  # FullFactorialDriver driver
+from openmdao.api import ExecComp
+from openmdao.api import SqliteRecorder  # Recorder
+from openmdao.api import Driver
+from openmdao.util.record_util import create_local_meta, update_local_meta
+import sqlitedict
+from pprint import pprint
+
+# PythonWrapper Components
+class Paraboloid(Component):
+    ''' Evaluates the equation f(x,y) = (x-3)^2 +xy +(y+4)^2 - 3 '''
+
+    def __init__(self):
+        super(Paraboloid, self).__init__()
+        
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=0.0)
+        
+        self.add_output('f_xy', shape=1)
+        
+    def solve_nonlinear(self, params, unknowns, resids):
+        ''' f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3 '''
+        
+        x = params['x']
+        y = params['y']
+        
+        unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+        
+class Sum(Component):
+    ''' Evaluates the equation f(y,z) = y + z '''
+
+    def __init__(self):
+        super(Sum, self).__init__()
+        
+        self.add_param('y', val=0.0)
+        self.add_param('z', val=0.0)
+        
+        self.add_output('f_yz', shape=1)
+        
+    def solve_nonlinear(self, params, unknowns, resids):
+        ''' f(y,z) = y + z '''
+        
+        y = params['y']
+        z = params['z']
+        
+        unknowns['f_yz'] = y + z
+        
+# 'ReplaySubProblem' SubProblem
+class ReplaySubProblem(SubProblem):
+    """ SubProblem frozen to the results recorded for it in an earlier study. Each run looks up its unknowns in the recorded cases
+    instead of running the inner Problem. Cases are found by the recorded values of the unknowns connected to its params, e.g. 'p1.y_init'
+    for 'Sub.p2.y_i' - not by the recorded params, since SubProblem copies an inner optimizer's final values back into params that are
+    its design variables. Every replayed param must be connected, and the recorder must have had record_params on. Values that were
+    never recorded raise a KeyError, or run the inner Problem if rerun_missing is set. """
+
+    def __init__(self, problem, params=(), unknowns=(), record='record_results', rerun_missing=False):
+        super(ReplaySubProblem, self).__init__(problem, params=params, unknowns=unknowns)
+
+        self.record = record
+        self.rerun_missing = rerun_missing
+        self._replay_params = list(params)
+        self._replay_unknowns = list(unknowns)
+        self._table = None  # {recorded values of the params' sources: (recorded unknowns, recorded params)}
+        self.replayed = 0
+        self.rerun = 0
+
+    def _load(self):
+        sources = []
+        for name in self._replay_params:
+            if self.pathname + '.' + name not in self._probdata.connections:
+                raise RuntimeError("{} can't replay param '{}' - it isn't connected to an unknown".format(self.pathname, name))
+            source, idxs = self._probdata.connections[self.pathname + '.' + name]
+            sources.append(self._probdata.to_prom_name[source])
+
+        self._table = {}
+        db = sqlitedict.SqliteDict(self.record, 'iterations', flag='r')
+        for data in db.values():
+            key = tuple(float(data['Unknowns'][source]) for source in sources)
+            self._table[key] = ([data['Unknowns'][self.pathname + '.' + name] for name in self._replay_unknowns],
+                                [data['Parameters'][self.pathname + '.' + name] for name in self._replay_params])
+        db.close()
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        if self._table is None:
+            self._load()
+
+        key = tuple(float(params[name]) for name in self._replay_params)
+        if key in self._table:
+            recorded_unknowns, recorded_params = self._table[key]
+            for name, value in zip(self._replay_unknowns, recorded_unknowns):
+                unknowns[name] = value
+            for name, value in zip(self._replay_params, recorded_params):
+                if name in self._unknowns_as_params:  # as SubProblem copies them back after its run
+                    params[name] = value
+            self.replayed += 1
+        elif self.rerun_missing:
+            super(ReplaySubProblem, self).solve_nonlinear(params, unknowns, resids)
+            self.rerun += 1
+        else:
+            raise KeyError('{} has no recorded case for {} = {}'.format(self.pathname, self._replay_params, key))
+
+# 'ReplayDriver' Driver
+class ReplayDriver(Driver):
+    """ Runs the model once for every case recorded in an earlier study, in recorded order, with the design variables set to their
+    recorded values, and records the results with its own recorders. Paired with ReplaySubProblem only the Components that aren't
+    frozen run, so adding a post-processing Component to a finished study costs one cheap pass instead of the whole study. """
+
+    def __init__(self, record='record_results'):
+        super(ReplayDriver, self).__init__()
+        self.record = record
+
+    def run(self, problem):
+        self.iter_count = 0
+        db = sqlitedict.SqliteDict(self.record, 'iterations', flag='r')
+        for data in db.values():
+            for name in self._desvars:
+                self.root.unknowns[name] = data['Unknowns'][name]
+
+            metadata = create_local_meta(None, 'Replay')
+            update_local_meta(metadata, (self.iter_count,))
+            with self.root._dircontext:
+                self.root.solve_nonlinear(metadata=metadata)
+            self.recorders.record_iteration(self.root, metadata)
+            self.iter_count += 1
+        db.close()
+        
+
+if __name__ == '__main__':
+
+    # Instantiate a Problem 'sub'
+    # Instantiate a Group and add it to sub
+    sub = Problem()
+    sub.root = Group()
+    
+    # Add the 'Paraboloid' Component to sub's root Group.
+    sub.root.add('Paraboloid', Paraboloid())
+    
+    # Initialize x as a IndepVarComp and add it to sub's root group as 'p1.x'
+    # p1.x and p2.y_i are initialized to 0.0 since neither was explicity initialized
+    # and they both have ranges of -50 to +50. Default initialization: (+50 - (-50)) / 2.0 = 0
+    sub.root.add('p1', IndepVarComp('x', 0.0))  
+    sub.root.add('p2', IndepVarComp('y_i', 0.0))
+    
+    # Initialize z as a IndepVarComp and add it to sub's root group as 'p3.z'
+    # Not sure if we will support running PETs with un-driven Problem Inputs but let's initialize it to 0.0
+    sub.root.add('p3', IndepVarComp('z', 0.0))
+    
+    # Connect components
+    sub.root.connect('p1.x', 'Paraboloid.x')
+    sub.root.connect('p2.y_i', 'Paraboloid.y')
+    
+    # Add ExecComps for all the Problem Inputs connected directly to Problem Outputs
+    # It seems reasonable to use the OpenMETA Problem Output's name as the output
+    sub.root.add('output1', ExecComp('y_f = input'))
+    sub.root.add('output2', ExecComp('z = input'))
+    
+    # Connect each IndepVarComp associated with Problem Inputs to its respective Problem Outputs
+    sub.root.connect('p2.y_i','output1.input')
+    sub.root.connect('p3.z','output2.input')
+    
+    # Add driver
+    sub.driver = ScipyOptimizer()
+    
+    # Modify the optimization driver's settings
+    sub.driver.options['optimizer'] = 'COBYLA'      # Type of Optimizer. 'COBYLA' does not require derivatives
+    sub.driver.options['tol'] = 1.0e-4              # Tolerance for termination. Not sure exactly what it represents. Default: 1.0e-6
+    sub.driver.options['maxiter'] = 200             # Maximum iterations. Default: 200
+    #sub.driver.opt_settings['rhobeg'] = 1.0        # COBYLA-specific setting. Initial step size. Default: 1.0
+    #sub.driver.opt_settings['catol'] = 0.1         # COBYLA-specific setting. Absolute tolerance for constraint violations. Default: 0.1
+    
+    # Add design variables, objective, and constraints to the optimization driver
+    sub.driver.add_desvar('p1.x', lower=-50, upper=50)
+    sub.driver.add_desvar('p2.y_i', lower=-50, upper=50)
+    sub.driver.add_objective('Paraboloid.f_xy')
+    
+    
+    # Instantiate a Problem 'top'
+    # Instantiate a Group and add it to top
+    top = Problem()
+    top.root = Group()
+    
+    # Add sub to top as a SubProblem called 'Sub' 
+    # Include sub's Problem Inputs and Problem Outputs in 'params' and 'unknowns' fields of SubProblem 
+    # 'Sub' answers from top_v1's 'record_results' instead of re-running its optimization
+    replaySub = ReplaySubProblem(sub, params=['p2.y_i', 'p3.z'],
+                                        unknowns=['Paraboloid.f_xy', 'p1.x', 'output1.y_f', 'output2.z'],  # This is where you designate what to expose to the outside world)
+                                        record='record_results')
+    top.root.add('Sub', replaySub)
+
+    # Add PythonWrapper Component 'Sum'
+    top.root.add('Sum', Sum())
+    
+    # New post-processing Component 'Total', added after the study was run
+    top.root.add('Total', ExecComp('total = f_xy + f_yz'))
+
+    # Initialize x and z as IndepVarComps and add them to top's root group
+    top.root.add('p1', IndepVarComp('y_init', 0.0))
+    top.root.add('p2', IndepVarComp('z', 0.0))
+    
+    # Connections
+    top.root.connect('p1.y_init', 'Sub.p2.y_i')
+    top.root.connect('p2.z', 'Sub.p3.z')
+    top.root.connect('Sub.output1.y_f', 'Sum.y')
+    top.root.connect('Sub.output2.z', 'Sum.z')
+    top.root.connect('Sub.Paraboloid.f_xy', 'Total.f_xy')
+    top.root.connect('Sum.f_yz', 'Total.f_yz')
+    
+    # Add driver
+    # Replays the 11 cases of top_v1's FullFactorialDriver(num_levels=11)
+    top.driver = ReplayDriver(record='record_results')
+        
+    # Add design variables and objectives to the parameter study driver
+    top.driver.add_desvar('p1.y_init', lower=-50, upper=50)
+    top.driver.add_objective('Sub.Paraboloid.f_xy')
+    top.driver.add_objective('Sub.p1.x')
+    top.driver.add_objective('Sub.output1.y_f')
+    top.driver.add_objective('Sum.f_yz')
+    top.driver.add_objective('Total.total')
+    
+    
+    # Data collection
+    recorder = SqliteRecorder('record_results_replay')  # the augmented results - top_v1's 'record_results' is left as it is
+    recorder.options['record_params'] = True
+    recorder.options['record_metadata'] = True
+    top.driver.add_recorder(recorder)
+    
+    # Setup, run, & cleanup
+    top.setup(check=False)
+    top.run()
+    top.cleanup()
+    
+    print('Sub: {} cases replayed, {} re-run'.format(replaySub.replayed, replaySub.rerun))
+    
+    # Data retrieval & display
+    # Old way - good for debugging IndepVars
+    db = sqlitedict.SqliteDict( 'record_results_replay', 'iterations' )
+    db_keys = list( db.keys() ) # list() needed for compatibility with Python 3. Not needed for Python 2
+    for i in db_keys:
+        data = db[i]
+        print('\n')
+        print(data['Unknowns'])
+        print(data['Parameters'])
\ No newline at end of file
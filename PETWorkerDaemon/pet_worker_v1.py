@@ -0,0 +1,185 @@
+'''
+# Name: pet_worker_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Long-lived local worker that keeps openmdao.api, scipy and sqlitedict imported and runs PET jobs sent to it over a local socket,
+#           so short PETs no longer pay for interpreter startup and imports on every launch
+
+# Inputs: 'serve' - start the worker
+#         'submit <script.py | mdao_config.json | module:factory>' - run a PET job on the worker and stream its output back
+
+# Outputs: The job's stdout/stderr, followed by its exit status
+'''
+
+from __future__ import print_function
+import sys
+import os
+import json
+import hmac
+import runpy
+import socket
+import binascii
+import importlib
+import traceback
+try:
+    import socketserver  # Python 3
+except ImportError:
+    import SocketServer as socketserver  # Python 2
+
+HOST = '127.0.0.1'  # Only ever listen on the local machine
+PORT = 7700
+TOKEN_FILE = os.path.join(os.path.expanduser('~'), '.pet_worker_token')  # Shared secret - only its owner can read it
+
+def write_token(path=TOKEN_FILE):
+    ''' Writes a new random token to a file only the current user can read or write, and returns it. '''
+
+    token = binascii.hexlify(os.urandom(32)).decode('ascii')
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    os.chmod(path, 0o600)  # an existing file keeps its old mode through os.open
+    with os.fdopen(fd, 'w') as f_out:
+        f_out.write(token)
+    return token
+
+def read_token(path=TOKEN_FILE):
+    with open(path) as f_in:
+        return f_in.read().strip()
+
+def run_job(job):
+    ''' Runs a single PET job in a clean '__main__' namespace, from the directory that holds it. '''
+
+    if 'script' in job:
+        # A PET script like the ones in this repo
+        path = os.path.abspath(job['script'])
+        os.chdir(os.path.dirname(path))
+        sys.argv = [path]
+        runpy.run_path(path, run_name='__main__')
+    elif 'config' in job:
+        # A run_mdao config like old/mockup_mdao_config.json - same as `python -m run_mdao mdao_config.json`
+        path = os.path.abspath(job['config'])
+        os.chdir(os.path.dirname(path))
+        sys.argv = ['run_mdao', path]
+        runpy.run_module('run_mdao', run_name='__main__', alter_sys=True)
+    elif 'factory' in job:
+        # A 'module:function' that returns a Problem that hasn't been set up yet
+        module_name, func_name = job['factory'].split(':')
+        if job.get('cwd'):
+            os.chdir(job['cwd'])
+            sys.path.insert(0, job['cwd'])
+        prob = getattr(importlib.import_module(module_name), func_name)()
+        prob.setup(check=False)
+        prob.run()
+        prob.cleanup()
+    else:
+        raise ValueError("A job needs a 'script', 'config' or 'factory' entry: {}".format(job))
+
+
+class LineFlushingWriter(object):
+    ''' Wraps a socket file so every completed line is sent as soon as it is written. makefile('w', 1) doesn't do this in Python 3 -
+    there the 1 only sizes the byte buffer, and the text layer above it still holds output back until it has a full block. '''
+
+    def __init__(self, f_out):
+        self._f_out = f_out
+
+    def write(self, text):
+        self._f_out.write(text)
+        if '\n' in text:
+            self._f_out.flush()
+
+    def __getattr__(self, name):
+        return getattr(self._f_out, name)
+
+
+class PETJobHandler(socketserver.StreamRequestHandler):
+    ''' Reads one JSON job per connection and streams the job's output back over the same connection. Jobs without the worker's
+    token are refused - any local user can connect to the port, but only the token file's owner can run code with it. '''
+
+    def handle(self):
+        job = json.loads(self.rfile.readline().decode('utf-8'))
+        cwd = os.getcwd()
+
+        out = LineFlushingWriter(self.connection.makefile('w'))
+        if not hmac.compare_digest(str(job.pop('token', '')), str(self.server.token)):
+            out.write('Job refused: missing or wrong token\n' + json.dumps({'status': 1}) + '\n')
+            out.flush()
+            return
+
+        # Everything the PET prints goes straight back to the client as it is produced
+        sys.stdout = sys.stderr = out
+        status = 0
+        try:
+            run_job(job)
+        except SystemExit as e:
+            status = e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+        except Exception:
+            traceback.print_exc()
+            status = 1
+        finally:
+            sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+            os.chdir(cwd)
+
+        out.write('\n' + json.dumps({'status': status}) + '\n')
+        out.flush()
+
+
+# On platforms with fork() every job runs in a fresh child of the warm worker, so jobs can't leak state into each other.
+# Elsewhere (Windows) jobs run one at a time in the worker process itself.
+if hasattr(os, 'fork'):
+    class PETWorker(socketserver.ForkingMixIn, socketserver.TCPServer):
+        allow_reuse_address = True
+else:
+    class PETWorker(socketserver.TCPServer):
+        allow_reuse_address = True
+
+
+def serve(port=PORT):
+    # The expensive imports every PET pays for. Importing them once here means every job starts warm.
+    # (submit() deliberately doesn't import them - the client has to start fast too.)
+    import numpy
+    import scipy.optimize
+    import sqlitedict
+    import openmdao.api
+
+    server = PETWorker((HOST, port), PETJobHandler)
+    server.token = write_token()  # a new token for every worker, so an old one stops working
+    print('PET worker listening on {}:{} (token in {})'.format(HOST, port, TOKEN_FILE))
+    server.serve_forever()
+
+
+def submit(target, port=PORT):
+    ''' Sends a job to the worker and echoes its output. Returns the job's exit status. '''
+
+    if ':' in target and not os.path.exists(target):
+        job = {'factory': target, 'cwd': os.getcwd()}
+    elif target.endswith('.json'):
+        job = {'config': os.path.abspath(target)}
+    else:
+        job = {'script': os.path.abspath(target)}
+    job['token'] = read_token()
+
+    conn = socket.create_connection((HOST, port))
+    conn.sendall((json.dumps(job) + '\n').encode('utf-8'))
+
+    status = 1
+    for line in conn.makefile('r'):
+        if line.startswith('{"status"'):
+            status = json.loads(line)['status']
+        else:
+            sys.stdout.write(line)
+            sys.stdout.flush()
+    conn.close()
+    return status
+
+
+if __name__ == '__main__':
+
+    if len(sys.argv) >= 2 and sys.argv[1] == 'serve':
+        serve()
+    elif len(sys.argv) == 3 and sys.argv[1] == 'submit':
+        sys.exit(submit(sys.argv[2]))
+    else:
+        print('usage: pet_worker_v1.py serve | submit <script.py | mdao_config.json | module:factory>')
+        sys.exit(2)
@@ -0,0 +1,250 @@
+'''
+# Name: paraboloid_optimization_de_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Derivative-free optimization of a paraboloid encapsulated within a SubProblem in OpenMDAO using a population-based
+#           Differential Evolution driver that evaluates each generation as a batch. Run with `mpirun -n 4 python paraboloid_optimization_de_v1.py`
+#           to evaluate each generation in parallel.
+#           Adaption of OpenMDAO tutorial: http://openmdao.readthedocs.io/en/1.7.3/usr-guide/tutorials/paraboloid-tutorial.html
+
+# Inputs:
+
+# Outputs:
+'''
+
+from __future__ import print_function
+from openmdao.api import IndepVarComp, Component, Problem, Group
+from openmdao.drivers.predeterminedruns_driver import PredeterminedRunsDriver  # Base class of the DOE drivers - splits the cases across MPI processes
+from openmdao.util.record_util import create_local_meta, update_local_meta
+from openmdao.core.mpi_wrap import MPI
+if MPI:  # Running under mpirun
+    from openmdao.core.petsc_impl import PetscImpl as impl
+else:
+    from openmdao.api import BasicImpl as impl
+from openmdao.api import ScipyOptimizer  # Optimizer driver
+from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
+from openmdao.api import SubProblem  # Allows for nested drivers - not currently supported in OpenMETA - Introduced in OpenMDAO v.1.7.2.
+from openmdao.api import SqliteRecorder  # Recorder
+import sqlitedict  
+import numpy as np
+from pprint import pprint
+
+# 'Paraboloid' Component
+class Paraboloid(Component):
+    ''' Evaluates the equation f(x,y) = (x-3)^2 +xy +(y+4)^2 - 3 '''
+
+    def __init__(self):
+        super(Paraboloid, self).__init__()
+        
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=0.0)
+        
+        self.add_output('f_xy', shape=1)
+        
+    def solve_nonlinear(self, params, unknowns, resids):
+        ''' f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3 '''
+        
+        x = params['x']
+        y = params['y']
+        
+        unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+
+# 'DifferentialEvolutionDriver' Driver
+class DifferentialEvolutionDriver(PredeterminedRunsDriver):
+    ''' Derivative-free, population-based optimizer (DE/rand/1/bin). Each generation is evaluated as one batch of cases, split across
+    num_par_doe groups of MPI processes the same way the DOE drivers split their cases. Uses the same add_desvar/add_objective/add_constraint
+    API as ScipyOptimizer; constraints are handled with feasibility rules (a feasible point beats an infeasible one, and infeasible points
+    are ranked by their total constraint violation). '''
+
+    def __init__(self, num_par_doe=1):
+        super(DifferentialEvolutionDriver, self).__init__(num_par_doe=num_par_doe, load_balance=False)
+
+        self.options.add_option('pop_size', 20, lower=4, desc='Number of points in each generation')
+        self.options.add_option('max_gen', 100, lower=1, desc='Maximum number of generations')
+        self.options.add_option('F', 0.7, lower=0.0, upper=2.0, desc='Differential weight (mutation step size)')
+        self.options.add_option('CR', 0.9, lower=0.0, upper=1.0, desc='Crossover probability')
+        self.options.add_option('tol', 1.0e-6, lower=0.0, desc='Stop when the spread of the objective across the population falls below tol')
+        self.options.add_option('seed', 0, desc='Random seed - every MPI process must draw the same populations')
+
+    def _build_runlist(self):
+        ''' The cases of the generation being evaluated, as [(desvar, value)] lists like the DOE drivers' runlists. '''
+
+        for x in self._population:
+            case = []
+            j = 0
+            for name, meta in self._desvar_meta.items():
+                case.append((name, x[j:j+meta['size']]))
+                j += meta['size']
+            yield case
+
+    def _evaluate(self, population):
+        ''' Runs the model at every point of a generation. Returns a list of (objective, constraint violation) in population order. '''
+
+        self._population = population
+        results = {}
+        cases = list(self._build_runlist())
+        # Every group takes one point from each block of num_par_doe points. When the population doesn't divide evenly, the groups
+        # with no point left in the last block record a dummy case instead, so all of them make the same number of collective
+        # record_iteration calls (the same padding PredeterminedRunsDriver._get_case_w_nones does for the DOE drivers)
+        for block in range(0, len(cases), self._num_par_doe):
+            i = block + self._par_doe_id
+            if i >= len(cases):
+                self.recorders.record_iteration(self.root, None, dummy=True)
+                continue
+            case = cases[i]
+
+            for name, value in case:
+                self.set_desvar(name, value)
+
+            metadata = create_local_meta(None, 'DifferentialEvolution')
+            update_local_meta(metadata, (self.iter_count,))
+            with self.root._dircontext:
+                self.root.solve_nonlinear(metadata=metadata)
+            self.recorders.record_iteration(self.root, metadata)
+            self.iter_count += 1
+
+            objective = float(np.asarray(list(self.get_objectives().values())[0]).flat[0])
+            violation = 0.0
+            for name, con in self.get_constraints().items():
+                meta = self._con_meta[name]
+                con = np.asarray(con)
+                if meta['equals'] is not None:
+                    violation += np.sum(np.abs(con - meta['equals']))
+                if meta['lower'] is not None:
+                    violation += np.sum(np.maximum(meta['lower'] - con, 0.0))
+                if meta['upper'] is not None:
+                    violation += np.sum(np.maximum(con - meta['upper'], 0.0))
+            results[i] = (objective, violation)
+
+        # Share every group's results so all processes agree on the next generation
+        if self._num_par_doe > 1:
+            for part in self._full_comm.allgather(results):
+                results.update(part)
+        return [results[i] for i in range(len(population))]
+
+    def run(self, problem):
+        ''' Evolves the population until the objective spread falls below tol or max_gen generations have run. '''
+
+        self.iter_count = 0
+        self._desvar_meta = self.get_desvar_metadata()
+        self._con_meta = self.get_constraint_metadata()
+        lower = np.concatenate([np.resize(meta['lower'], meta['size']) for meta in self._desvar_meta.values()])
+        upper = np.concatenate([np.resize(meta['upper'], meta['size']) for meta in self._desvar_meta.values()])
+
+        rng = np.random.RandomState(self.options['seed'])
+        n = self.options['pop_size']
+        population = lower + rng.rand(n, len(lower))*(upper - lower)
+        fitness = self._evaluate(population)
+
+        for gen in range(self.options['max_gen']):
+            # Mutation and crossover: one trial point per member, built from three other distinct members
+            trials = np.empty_like(population)
+            for i in range(n):
+                a, b, c = rng.choice([k for k in range(n) if k != i], 3, replace=False)
+                mutant = np.clip(population[a] + self.options['F']*(population[b] - population[c]), lower, upper)
+                cross = rng.rand(len(lower)) < self.options['CR']
+                cross[rng.randint(len(lower))] = True
+                trials[i] = np.where(cross, mutant, population[i])
+
+            # Selection: a trial replaces its parent if it is at least as good - (violation, objective) compared in that order
+            trial_fitness = self._evaluate(trials)
+            for i in range(n):
+                if (trial_fitness[i][1], trial_fitness[i][0]) <= (fitness[i][1], fitness[i][0]):
+                    population[i] = trials[i]
+                    fitness[i] = trial_fitness[i]
+
+            objectives = [f[0] for f in fitness]
+            if max(objectives) - min(objectives) < self.options['tol']:
+                break
+
+        # Leave the model at the best point found
+        best = min(range(n), key=lambda i: (fitness[i][1], fitness[i][0]))
+        self._num_par_doe, num_par_doe = 1, self._num_par_doe  # every process evaluates the best point
+        self._par_doe_id, par_doe_id = 0, self._par_doe_id
+        self._evaluate(population[best:best+1])
+        self._num_par_doe, self._par_doe_id = num_par_doe, par_doe_id
+        
+if __name__ == '__main__':
+
+    # Instantiate a sub-level Problem 'paraboloidProblem'.
+    # Instantiate a Group and add it to paraboloidProblem.
+    paraboloidProblem = Problem()
+    paraboloidProblem.root = Group()
+    
+    # Add the 'Paraboloid' Component to paraboloidProblem's root Group.
+    paraboloidProblem.root.add('Paraboloid', Paraboloid())
+    
+    # Initialize x and y values in seperate IndepVarComps and add them to paraboloidProblem's root group
+    # These are added for the two Problem Inputs 'x' and 'y'
+    paraboloidProblem.root.add('p1', IndepVarComp('x', 0.0))
+    paraboloidProblem.root.add('p2', IndepVarComp('y', 0.0))
+    
+    # Connect the IndepVarComps 'p1.x' and 'p2.y' to 'T.Paraboloid.x' and 'T.Paraboloid.y' respectively
+    paraboloidProblem.root.connect('p1.x', 'Paraboloid.x')
+    paraboloidProblem.root.connect('p2.y', 'Paraboloid.y')
+
+    # Paraboloid has no explicitly declared driver
+    
+    
+    # Instantiate a top-level Problem 'ParaboloidOptimization'
+    # Instantiate a Group and add it to ParaboloidOptimization
+    ParaboloidOptimization = Problem(impl=impl)
+    ParaboloidOptimization.root = Group()
+    
+    # Initialize x and y as IndepVarComps and add them to ParaboloidOptimization's root group
+    ParaboloidOptimization.root.add('p1', IndepVarComp('x', 0.0)) 
+    ParaboloidOptimization.root.add('p2', IndepVarComp('y', 0.0)) 
+    
+    # Add paraboloidProblem to ParaboloidOptimization as a SubProblem called 'ParaboloidProblem' 
+    # Include paraboloidProblem's Problem Inputs and Problem Outputs in 'params' and 'unknowns' fields SubProblem 
+    ParaboloidOptimization.root.add('ParaboloidProblem', SubProblem(paraboloidProblem, params=['p1.x', 'p2.y'],
+                                            unknowns=['Paraboloid.f_xy']))  # This is where you designate what to expose to the outside world
+    
+    # Connect ParaboloidOptimization's IndepVarComps to ParaboloidProblem's params
+    ParaboloidOptimization.root.connect('p1.x', 'ParaboloidProblem.p1.x')
+    ParaboloidOptimization.root.connect('p2.y', 'ParaboloidProblem.p2.y')
+    
+    # Add driver
+    # Drop-in replacement for the COBYLA ScipyOptimizer - each generation of 20 points is split across the MPI processes
+    ParaboloidOptimization.driver = DifferentialEvolutionDriver(num_par_doe=MPI.COMM_WORLD.size if MPI else 1)
+    
+    # Modify the optimization driver's settings
+    ParaboloidOptimization.driver.options['pop_size'] = 20  # Points per generation. Default: 20
+    ParaboloidOptimization.driver.options['max_gen'] = 100  # Maximum generations. Default: 100
+    ParaboloidOptimization.driver.options['tol'] = 1.0e-4  # Stop when the spread of f_xy across the population is below tol. Default: 1.0e-6
+    
+    # Add design variables, objective, and constraints to the optimization driver
+    ParaboloidOptimization.driver.add_desvar('p1.x', lower=-50, upper=50)
+    ParaboloidOptimization.driver.add_desvar('p2.y', lower=-50, upper=50)
+    ParaboloidOptimization.driver.add_objective('ParaboloidProblem.Paraboloid.f_xy')
+    
+    
+    # Data collection
+    recorder = SqliteRecorder('record_results')
+    recorder.options['record_params'] = True
+    recorder.options['record_metadata'] = True
+    ParaboloidOptimization.driver.add_recorder(recorder)
+    
+    # Setup
+    ParaboloidOptimization.setup(check=False)
+    
+    # Run 
+    ParaboloidOptimization.run()
+    
+    # Cleanup
+    ParaboloidOptimization.cleanup()
+    
+    # Data retrieval & display - only rank 0 writes 'record_results'
+    if MPI is None or MPI.COMM_WORLD.rank == 0:
+        # Old way - good for debugging IndepVars
+        db = sqlitedict.SqliteDict( 'record_results', 'iterations' )
+        db_keys = list( db.keys() ) # list() needed for compatibility with Python 3. Not needed for Python 2
+        for i in db_keys:
+            data = db[i]
+            print('\n')
+            print(data['Unknowns'])
+            print(data['Parameters'])
\ No newline at end of file
@@ -0,0 +1,135 @@
+'''
+# Name: paraboloid_optimization_parallelfd_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Gradient-based (SLSQP) optimization of a paraboloid encapsulated within a SubProblem in OpenMDAO, with the finite difference
+#           steps of each gradient evaluated in parallel. Run with `mpirun -n 2 python paraboloid_optimization_parallelfd_v1.py`
+#           Adaption of OpenMDAO tutorial: http://openmdao.readthedocs.io/en/1.7.3/usr-guide/tutorials/paraboloid-tutorial.html
+
+# Inputs:
+
+# Outputs:
+'''
+
+from __future__ import print_function
+from openmdao.api import IndepVarComp, Component, Problem, Group
+from openmdao.api import ParallelFDGroup  # Group whose finite difference steps are spread across MPI processes
+from openmdao.core.mpi_wrap import MPI
+if MPI:  # Running under mpirun
+    from openmdao.core.petsc_impl import PetscImpl as impl
+else:
+    from openmdao.api import BasicImpl as impl
+from openmdao.api import ScipyOptimizer  # Optimizer driver
+from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
+from openmdao.api import SubProblem  # Allows for nested drivers - not currently supported in OpenMETA - Introduced in OpenMDAO v.1.7.2.
+from openmdao.api import SqliteRecorder  # Recorder
+import sqlitedict  
+from pprint import pprint
+
+# 'Paraboloid' Component
+class Paraboloid(Component):
+    ''' Evaluates the equation f(x,y) = (x-3)^2 +xy +(y+4)^2 - 3 '''
+
+    def __init__(self):
+        super(Paraboloid, self).__init__()
+        
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=0.0)
+        
+        self.add_output('f_xy', shape=1)
+        
+    def solve_nonlinear(self, params, unknowns, resids):
+        ''' f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3 '''
+        
+        x = params['x']
+        y = params['y']
+        
+        unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+        
+if __name__ == '__main__':
+
+    # Instantiate a sub-level Problem 'paraboloidProblem'.
+    # Instantiate a Group and add it to paraboloidProblem.
+    paraboloidProblem = Problem()
+    paraboloidProblem.root = Group()
+    
+    # Add the 'Paraboloid' Component to paraboloidProblem's root Group.
+    paraboloidProblem.root.add('Paraboloid', Paraboloid())
+    
+    # Initialize x and y values in seperate IndepVarComps and add them to paraboloidProblem's root group
+    # These are added for the two Problem Inputs 'x' and 'y'
+    paraboloidProblem.root.add('p1', IndepVarComp('x', 0.0))
+    paraboloidProblem.root.add('p2', IndepVarComp('y', 0.0))
+    
+    # Connect the IndepVarComps 'p1.x' and 'p2.y' to 'T.Paraboloid.x' and 'T.Paraboloid.y' respectively
+    paraboloidProblem.root.connect('p1.x', 'Paraboloid.x')
+    paraboloidProblem.root.connect('p2.y', 'Paraboloid.y')
+
+    # Paraboloid has no explicitly declared driver
+    
+    
+    # Instantiate a top-level Problem 'ParaboloidOptimization'
+    # Instantiate a Group and add it to ParaboloidOptimization
+    ParaboloidOptimization = Problem(impl=impl)
+    ParaboloidOptimization.root = ParallelFDGroup(2)  # one process per design variable, so a whole gradient costs one ParaboloidProblem run
+    
+    # SubProblem has no analytic derivatives, so finite difference the whole root Group.
+    # Each process has its own copy of ParaboloidProblem, so the perturbed runs are independent of each other.
+    ParaboloidOptimization.root.deriv_options['type'] = 'fd'
+    
+    # Initialize x and y as IndepVarComps and add them to ParaboloidOptimization's root group
+    ParaboloidOptimization.root.add('p1', IndepVarComp('x', 0.0)) 
+    ParaboloidOptimization.root.add('p2', IndepVarComp('y', 0.0)) 
+    
+    # Add paraboloidProblem to ParaboloidOptimization as a SubProblem called 'ParaboloidProblem' 
+    # Include paraboloidProblem's Problem Inputs and Problem Outputs in 'params' and 'unknowns' fields SubProblem 
+    ParaboloidOptimization.root.add('ParaboloidProblem', SubProblem(paraboloidProblem, params=['p1.x', 'p2.y'],
+                                            unknowns=['Paraboloid.f_xy']))  # This is where you designate what to expose to the outside world
+    
+    # Connect ParaboloidOptimization's IndepVarComps to ParaboloidProblem's params
+    ParaboloidOptimization.root.connect('p1.x', 'ParaboloidProblem.p1.x')
+    ParaboloidOptimization.root.connect('p2.y', 'ParaboloidProblem.p2.y')
+    
+    # Add driver
+    ParaboloidOptimization.driver = ScipyOptimizer()
+    
+    # Modify the optimization driver's settings
+    ParaboloidOptimization.driver.options['optimizer'] = 'SLSQP'  # Type of Optimizer. 'SLSQP' uses gradients and supports the desvar bounds
+    ParaboloidOptimization.driver.options['tol'] = 1.0e-4  # Tolerance for termination. Default: 1.0e-6
+    ParaboloidOptimization.driver.options['maxiter'] = 200  # Maximum iterations. Default: 200
+    
+    # Add design variables, objective, and constraints to the optimization driver
+    ParaboloidOptimization.driver.add_desvar('p1.x', lower=-50, upper=50)
+    ParaboloidOptimization.driver.add_desvar('p2.y', lower=-50, upper=50)
+    ParaboloidOptimization.driver.add_objective('ParaboloidProblem.Paraboloid.f_xy')
+    
+    
+    # Data collection
+    recorder = SqliteRecorder('record_results')
+    recorder.options['record_params'] = True
+    recorder.options['record_metadata'] = True
+    ParaboloidOptimization.driver.add_recorder(recorder)
+    
+    # Setup
+    ParaboloidOptimization.setup(check=False)
+    
+    # Run 
+    ParaboloidOptimization.run()
+    
+    # Cleanup
+    ParaboloidOptimization.cleanup()
+    
+    # Data retrieval & display - only rank 0 writes 'record_results'
+    if MPI is None or MPI.COMM_WORLD.rank == 0:
+        # Old way - good for debugging IndepVars
+        db = sqlitedict.SqliteDict( 'record_results', 'iterations' )
+        db_keys = list( db.keys() ) # list() needed for compatibility with Python 3. Not needed for Python 2
+        for i in db_keys:
+            data = db[i]
+            print('\n')
+            print(data['Unknowns'])
+            print(data['Parameters'])
\ No newline at end of file
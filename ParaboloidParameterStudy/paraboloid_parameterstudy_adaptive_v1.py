@@ -0,0 +1,203 @@
+'''
+# Name: paraboloid_parameterstudy_adaptive_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Adaptive parameter study of a paraboloid encapsulated within a SubProblem in OpenMDAO - starts from a coarse full factorial grid
+#           and only refines the cells where the objective varies, or that hold the best objective found so far
+#           Adaption of OpenMDAO tutorial: http://openmdao.readthedocs.io/en/1.7.3/usr-guide/tutorials/paraboloid-tutorial.html
+
+# Inputs:
+
+# Outputs:
+'''
+
+from __future__ import print_function
+from openmdao.api import IndepVarComp, Component, Problem, Group
+from openmdao.api import Driver  # Base class for the AdaptiveFullFactorialDriver
+from openmdao.util.record_util import create_local_meta, update_local_meta
+from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
+from openmdao.api import SubProblem  # Allows for nested drivers - not currently supported in OpenMETA - Introduced in OpenMDAO v.1.7.2.
+from openmdao.api import SqliteRecorder  # Recorder
+import sqlitedict  
+import numpy as np
+import itertools
+from pprint import pprint
+
+# 'Paraboloid' Component
+class Paraboloid(Component):
+    ''' Evaluates the equation f(x,y) = (x-3)^2 +xy +(y+4)^2 - 3 '''
+
+    def __init__(self):
+        super(Paraboloid, self).__init__()
+        
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=0.0)
+        
+        self.add_output('f_xy', shape=1)
+        
+    def solve_nonlinear(self, params, unknowns, resids):
+        ''' f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3 '''
+        
+        x = params['x']
+        y = params['y']
+        
+        unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+
+# 'AdaptiveFullFactorialDriver' Driver
+class AdaptiveFullFactorialDriver(Driver):
+    ''' Parameter study that starts from a coarse full factorial grid and recursively halves only the grid cells whose objectives vary
+    by more than tol across their corners, or whose lowest corner is within tol of the best (lowest) first objective found so far,
+    until max_evals points have run. Every point is recorded the same way FullFactorialDriver records its cases. '''
+
+    def __init__(self, num_levels=3):
+        super(AdaptiveFullFactorialDriver, self).__init__()
+
+        self.options.add_option('num_levels', num_levels, lower=2, desc='Levels of the initial coarse grid')
+        self.options.add_option('tol', 1.0, lower=0.0, desc='Refine a cell when an objective varies by more than tol across its corners, or is within tol of the best')
+        self.options.add_option('max_evals', 121, lower=1, desc='Evaluation budget')
+        self.options.add_option('max_depth', 4, lower=0, desc='Maximum number of times a coarse cell can be halved')
+
+    def _evaluate(self, point):
+        ''' Runs the model at a grid point (once) and returns its objective values. '''
+
+        if point not in self._results:
+            for name, val in zip(self._names, point):
+                self.set_desvar(name, val)
+
+            metadata = create_local_meta(None, 'Driver')
+            update_local_meta(metadata, (self.iter_count,))
+            with self.root._dircontext:
+                self.root.solve_nonlinear(metadata=metadata)
+            self.recorders.record_iteration(self.root, metadata)
+            self.iter_count += 1
+
+            self._results[point] = [float(np.asarray(val).flat[0]) for val in self.get_objectives().values()]
+        return self._results[point]
+
+    def _cell(self, lower, upper, depth):
+        ''' Evaluates a cell's corners. Returns (variation of the objectives across the corners, depth, lower, upper, corners). '''
+
+        corners = list(itertools.product(*zip(lower, upper)))
+        objectives = [self._evaluate(corner) for corner in corners]
+        variation = max(max(vals) - min(vals) for vals in zip(*objectives)) if objectives[0] else 0.0
+        return (variation, depth, lower, upper, corners)
+
+    def run(self, problem):
+        self.iter_count = 0
+        self._results = {}  # {grid point: objective values}
+        self._names = list(self.get_desvar_metadata().keys())
+        metas = list(self.get_desvar_metadata().values())
+
+        # Coarse full factorial grid
+        levels = [np.linspace(meta['lower'], meta['upper'], num=self.options['num_levels']).tolist() for meta in metas]
+        cells = []
+        for cell in itertools.product(*[range(len(level) - 1) for level in levels]):
+            lower = tuple(level[i] for level, i in zip(levels, cell))
+            upper = tuple(level[i+1] for level, i in zip(levels, cell))
+            cells.append(self._cell(lower, upper, 0))
+
+        # Refine cells near the best objective first (lowest corner first), then the most varying cells, until the budget runs out
+        while True:
+            best = min(self._results.values())[0]
+            ranked = []
+            for cell in cells:
+                variation, depth, lower, upper, corners = cell
+                lowest = min(self._results[corner][0] for corner in corners)
+                near_best = lowest - best <= self.options['tol']
+                if depth < self.options['max_depth'] and (near_best or variation > self.options['tol']):
+                    ranked.append((not near_best, lowest if near_best else -variation, depth, cell))
+            if not ranked:
+                break
+            cell = min(ranked, key=lambda r: r[:3])[3]
+            variation, depth, lower, upper, corners = cell
+
+            mid = tuple((lo + hi)/2.0 for lo, hi in zip(lower, upper))
+            new_points = [p for p in itertools.product(*zip(lower, mid, upper)) if p not in self._results]
+            if self.iter_count + len(new_points) > self.options['max_evals']:
+                break
+
+            cells.remove(cell)
+            for half in itertools.product(*[((lo, m), (m, hi)) for lo, m, hi in zip(lower, mid, upper)]):
+                cells.append(self._cell(tuple(h[0] for h in half), tuple(h[1] for h in half), depth + 1))
+        
+if __name__ == '__main__':
+
+    # Instantiate a sub-level Problem 'paraboloidProblem'.
+    # Instantiate a Group and add it to paraboloidProblem.
+    paraboloidProblem = Problem()
+    paraboloidProblem.root = Group()
+    
+    # Add the 'Paraboloid' Component to paraboloidProblem's root Group.
+    paraboloidProblem.root.add('Paraboloid', Paraboloid())
+    
+    # Initialize x and y values in seperate IndepVarComps and add them to paraboloidProblem's root group
+    # These are added for the two Problem Inputs 'x' and 'y'
+    paraboloidProblem.root.add('p1', IndepVarComp('x', 0.0))
+    paraboloidProblem.root.add('p2', IndepVarComp('y', 0.0))
+    
+    # Connect the IndepVarComps 'p1.x' and 'p2.y' to 'T.Paraboloid.x' and 'T.Paraboloid.y' respectively
+    paraboloidProblem.root.connect('p1.x', 'Paraboloid.x')
+    paraboloidProblem.root.connect('p2.y', 'Paraboloid.y')
+
+    # Paraboloid has no explicitly declared driver
+    
+    
+    # Instantiate a top-level Problem 'ParaboloidParameterStudy'
+    # Instantiate a Group and add it to ParaboloidParameterStudy
+    ParaboloidParameterStudy = Problem()
+    ParaboloidParameterStudy.root = Group()
+    
+    # Initialize x and y as IndepVarComps and add them to ParaboloidParameterStudy's root group
+    ParaboloidParameterStudy.root.add('p1', IndepVarComp('x', 0.0)) 
+    ParaboloidParameterStudy.root.add('p2', IndepVarComp('y', 0.0)) 
+    
+    # Add paraboloidProblem to ParaboloidParameterStudy as a SubProblem called 'ParaboloidProblem' 
+    # Include paraboloidProblem's Problem Inputs and Problem Outputs in 'params' and 'unknowns' fields SubProblem 
+    ParaboloidParameterStudy.root.add('ParaboloidProblem', SubProblem(paraboloidProblem, params=['p1.x', 'p2.y'],
+                                            unknowns=['Paraboloid.f_xy']))  # This is where you designate what to expose to the outside world
+    
+    # Connect ParaboloidParameterStudy's IndepVarComps to ParaboloidProblem's params
+    ParaboloidParameterStudy.root.connect('p1.x', 'ParaboloidProblem.p1.x')
+    ParaboloidParameterStudy.root.connect('p2.y', 'ParaboloidProblem.p2.y')
+    
+    # Add driver
+    # Start from a 5x5 grid (instead of 11x11) and spend the rest of the same 121 point budget where f_xy changes the most
+    ParaboloidParameterStudy.driver = AdaptiveFullFactorialDriver(num_levels=5)
+    ParaboloidParameterStudy.driver.options['tol'] = 100.0  # Refine cells where f_xy varies by more than this, or comes within this of the best f_xy. Default: 1.0
+    ParaboloidParameterStudy.driver.options['max_evals'] = 121  # Evaluation budget - same as FullFactorialDriver(num_levels=11). Default: 121
+    ParaboloidParameterStudy.driver.options['max_depth'] = 4  # Finest cell is 1/16th of a coarse cell. Default: 4
+    
+    # Add design variables and objectives to the parameter study driver
+    ParaboloidParameterStudy.driver.add_desvar('p1.x', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_desvar('p2.y', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_objective('ParaboloidProblem.Paraboloid.f_xy')
+    
+    
+    # Data collection
+    recorder = SqliteRecorder('record_results')
+    recorder.options['record_params'] = True
+    recorder.options['record_metadata'] = True
+    ParaboloidParameterStudy.driver.add_recorder(recorder)
+    
+    # Setup
+    ParaboloidParameterStudy.setup(check=False)
+    
+    # Run 
+    ParaboloidParameterStudy.run()
+    
+    # Cleanup
+    ParaboloidParameterStudy.cleanup()
+    
+    # Data retrieval & display
+    # Old way - good for debugging IndepVars
+    db = sqlitedict.SqliteDict( 'record_results', 'iterations' )
+    db_keys = list( db.keys() ) # list() needed for compatibility with Python 3. Not needed for Python 2
+    for i in db_keys:
+        data = db[i]
+        print('\n')
+        print(data['Unknowns'])
+        print(data['Parameters'])
\ No newline at end of file
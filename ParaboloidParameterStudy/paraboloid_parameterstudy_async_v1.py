@@ -0,0 +1,238 @@
+'''
+# Name: paraboloid_parameterstudy_async_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Parameter study of a paraboloid evaluated by an external process, with many cases in flight at once on an asyncio event loop.
+#           Requires Python 3.5+.
+#           Adaption of OpenMDAO tutorial: http://openmdao.readthedocs.io/en/1.7.3/usr-guide/tutorials/paraboloid-tutorial.html
+
+# Inputs:
+
+# Outputs:
+'''
+
+from __future__ import print_function
+from openmdao.api import IndepVarComp, Component, Problem, Group
+from openmdao.api import FullFactorialDriver  # FullFactorialDriver driver
+from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
+from openmdao.api import SqliteRecorder  # Recorder
+from openmdao.util.record_util import create_local_meta, update_local_meta
+from abc import ABCMeta, abstractmethod
+import asyncio
+import copy
+import sys
+import time
+import sqlitedict
+import numpy as np
+from pprint import pprint
+
+# 'AsyncComponent' Component
+class AsyncComponent(Component, metaclass=ABCMeta):
+    ''' Component whose work is waiting on a subprocess, pipe or service. Subclasses implement
+    async def solve_nonlinear_async(self, params, unknowns, resids). AsyncFullFactorialDriver awaits it directly so that many cases
+    can be in flight at once; under any other driver solve_nonlinear runs it to completion, so an AsyncComponent can go anywhere a
+    Component can. '''
+
+    @abstractmethod
+    async def solve_nonlinear_async(self, params, unknowns, resids):
+        ''' Computes the unknowns from the params, awaiting the external work. '''
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self.solve_nonlinear_async(params, unknowns, resids))
+        finally:
+            loop.close()
+
+# 'AsyncParaboloid' Component
+class AsyncParaboloid(AsyncComponent):
+    ''' Evaluates the equation f(x,y) = (x-3)^2 +xy +(y+4)^2 - 3 in a separate Python process, like a wrapper around an external solver. '''
+
+    def __init__(self):
+        super(AsyncParaboloid, self).__init__()
+
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=0.0)
+
+        self.add_output('f_xy', shape=1)
+
+    async def solve_nonlinear_async(self, params, unknowns, resids):
+        ''' f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3 '''
+
+        x = float(params['x'])
+        y = float(params['y'])
+
+        proc = await asyncio.create_subprocess_exec(sys.executable, '-c', 'x, y = {!r}, {!r}; print((x-3.0)**2 + x*y + (y+4.0)**2 - 3.0)'.format(x, y),
+                                                    stdout=asyncio.subprocess.PIPE)
+        try:
+            out, err = await proc.communicate()
+        except asyncio.CancelledError:
+            proc.kill()  # the case was cancelled or timed out - don't leave the process behind
+            raise
+        unknowns['f_xy'] = float(out)
+
+# 'AsyncFullFactorialDriver' Driver
+class AsyncFullFactorialDriver(FullFactorialDriver):
+    ''' FullFactorialDriver that runs its cases as coroutines on an asyncio event loop, up to max_concurrency at once. Each case runs the
+    root's components in order on its own copies of their params and unknowns, so cases never share state; AsyncComponents are awaited
+    and ordinary Components run inline on the loop. A case that takes longer than timeout seconds is cancelled and recorded with NaN
+    outputs and success = 0. If a case raises, every case still in flight is cancelled. Only whole-variable connections are supported. '''
+
+    def __init__(self, num_levels=1, max_concurrency=100, timeout=None):
+        super(AsyncFullFactorialDriver, self).__init__(num_levels=num_levels)
+
+        self.options.add_option('max_concurrency', max_concurrency, lower=1, desc='Maximum number of cases in flight at once')
+        self.options.add_option('timeout', timeout, desc='Seconds a case may take before it is cancelled (None - no limit)')
+
+    def run(self, problem):
+        ''' Evaluates every case of the full factorial on a new event loop. '''
+
+        loop = asyncio.new_event_loop()
+        try:
+            loop.run_until_complete(self._run_cases())
+        finally:
+            loop.close()
+
+    async def _run_cases(self):
+        self._components = list(self.root.components(recurse=True))
+        self._connections = self.root._probdata.connections
+
+        # Starting values of every unknown, by absolute path
+        self._initial = dict((acc.meta['pathname'], copy.copy(self.root.unknowns[name])) for name, acc in self.root.unknowns._dat.items())
+
+        semaphore = asyncio.Semaphore(self.options['max_concurrency'])
+
+        async def run_case(i, run):
+            async with semaphore:
+                values = dict(self._initial)
+                for name, value in run:
+                    meta = self._desvars[name]
+                    values[self.root.unknowns._dat[name].meta['pathname']] = np.asarray(value)/meta['scaler'] - meta['adder']
+
+                metadata = create_local_meta(None, 'Driver')
+                update_local_meta(metadata, (i,))
+                try:
+                    cases = await asyncio.wait_for(self._evaluate(values), self.options['timeout'])
+                except asyncio.TimeoutError:
+                    cases = self._evaluate_failed(values)
+                    metadata['success'] = 0
+                    metadata['msg'] = 'Case timed out after {} s'.format(self.options['timeout'])
+                self._record(cases, metadata)
+
+        tasks = [asyncio.ensure_future(run_case(i, run)) for i, run in enumerate(self._build_runlist())]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+        self.iter_count = len(tasks)
+
+    async def _evaluate(self, values):
+        ''' Runs every component on this case's values. Returns [(component, params, unknowns)] in execution order. '''
+
+        cases = []
+        for comp in self._components:
+            params = {}
+            for name, acc in comp.params._dat.items():
+                src = self._connections.get(acc.meta['pathname'])
+                params[name] = values[src[0]] if src else comp.params[name]
+            unknowns = dict((name, values[acc.meta['pathname']]) for name, acc in comp.unknowns._dat.items())
+
+            if isinstance(comp, AsyncComponent):
+                await comp.solve_nonlinear_async(params, unknowns, {})
+            else:
+                comp.solve_nonlinear(params, unknowns, {})
+
+            for name, acc in comp.unknowns._dat.items():
+                values[acc.meta['pathname']] = unknowns[name]
+            cases.append((comp, params, unknowns))
+        return cases
+
+    def _evaluate_failed(self, values):
+        ''' The record of a case that didn't finish: its inputs, and NaN for everything computed from them. '''
+
+        cases = []
+        for comp in self._components:
+            params = {}
+            for name, acc in comp.params._dat.items():
+                src = self._connections.get(acc.meta['pathname'])
+                params[name] = values[src[0]] if src else comp.params[name]
+            if isinstance(comp, IndepVarComp):
+                unknowns = dict((name, values[acc.meta['pathname']]) for name, acc in comp.unknowns._dat.items())
+            else:
+                unknowns = dict((name, np.nan*np.ones_like(acc.val)) for name, acc in comp.unknowns._dat.items())
+            for name, acc in comp.unknowns._dat.items():
+                values[acc.meta['pathname']] = unknowns[name]
+            cases.append((comp, params, unknowns))
+        return cases
+
+    def _record(self, cases, metadata):
+        ''' Loads a finished case into the model's vectors and records it. Runs on the loop's thread, so records never interleave. '''
+
+        for comp, params, unknowns in cases:
+            for name, value in params.items():
+                comp.params[name] = value
+            for name, value in unknowns.items():
+                comp.unknowns[name] = value
+        self.recorders.record_iteration(self.root, metadata)
+
+if __name__ == '__main__':
+
+    # Instantiate a top-level Problem 'ParaboloidParameterStudy'
+    # Instantiate a Group and add it to ParaboloidParameterStudy
+    ParaboloidParameterStudy = Problem()
+    ParaboloidParameterStudy.root = Group()
+
+    # Initialize x and y as IndepVarComps and add them to ParaboloidParameterStudy's root group
+    ParaboloidParameterStudy.root.add('p1', IndepVarComp('x', 0.0))
+    ParaboloidParameterStudy.root.add('p2', IndepVarComp('y', 0.0))
+
+    # 'Paraboloid' runs in its own process; the ExecComp constraint is an ordinary synchronous Component
+    ParaboloidParameterStudy.root.add('Paraboloid', AsyncParaboloid())
+    ParaboloidParameterStudy.root.add('Constraint', ExecComp('c = -x + y', x=0.0, y=0.0))
+
+    ParaboloidParameterStudy.root.connect('p1.x', ['Paraboloid.x', 'Constraint.x'])
+    ParaboloidParameterStudy.root.connect('p2.y', ['Paraboloid.y', 'Constraint.y'])
+
+    # Add driver
+    # Up to 32 Paraboloid processes at once; a case that takes over 10 s is recorded as failed
+    ParaboloidParameterStudy.driver = AsyncFullFactorialDriver(num_levels=11, max_concurrency=32, timeout=10.0)
+
+    # Add design variables and objectives to the parameter study driver
+    ParaboloidParameterStudy.driver.add_desvar('p1.x', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_desvar('p2.y', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_objective('Paraboloid.f_xy')
+    ParaboloidParameterStudy.driver.add_constraint('Constraint.c', upper=-15.0)
+
+
+    # Data collection
+    recorder = SqliteRecorder('record_results')
+    recorder.options['record_params'] = True
+    recorder.options['record_metadata'] = True
+    ParaboloidParameterStudy.driver.add_recorder(recorder)
+
+    # Setup
+    ParaboloidParameterStudy.setup(check=False)
+
+    # Run
+    start = time.time()
+    ParaboloidParameterStudy.run()
+    print('121 cases in {:.2f} s'.format(time.time()-start))
+
+    # Cleanup
+    ParaboloidParameterStudy.cleanup()
+
+    # Data retrieval & display
+    # Old way - good for debugging IndepVars
+    db = sqlitedict.SqliteDict( 'record_results', 'iterations' )
+    db_keys = list( db.keys() ) # list() needed for compatibility with Python 3. Not needed for Python 2
+    for i in db_keys:
+        data = db[i]
+        print('\n')
+        print(data['Unknowns'])
+        print(data['Parameters'])
@@ -0,0 +1,261 @@
+'''
+# Name: paraboloid_parameterstudy_streaming_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Million-case parameter study of a paraboloid in constant memory - cases are generated one at a time, evaluated, handed to a
+#           recorder thread through a bounded queue, written, and dropped, so peak memory doesn't grow with the number of cases.
+#           Adaption of OpenMDAO tutorial: http://openmdao.readthedocs.io/en/1.7.3/usr-guide/tutorials/paraboloid-tutorial.html
+
+# Inputs: --worker=K --workers=N - evaluate every Nth case starting at case K, so N processes can split one study
+
+# Outputs: record_results_stream[_K].db - one row per case
+'''
+
+from __future__ import print_function
+from openmdao.api import IndepVarComp, Component, Problem, Group
+from openmdao.api import FullFactorialDriver  # FullFactorialDriver driver
+from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
+from openmdao.recorders.base_recorder import BaseRecorder
+from openmdao.util.record_util import create_local_meta, update_local_meta
+from fnmatch import fnmatch
+from itertools import islice
+import threading
+import sqlite3
+import sys
+import time
+import numpy as np
+import six
+try:
+    from queue import Queue  # Python 3
+except ImportError:
+    from Queue import Queue  # Python 2
+try:
+    import resource  # not on Windows
+except ImportError:
+    resource = None
+from pprint import pprint
+
+# 'Paraboloid' Component
+class Paraboloid(Component):
+    ''' Evaluates the equation f(x,y) = (x-3)^2 +xy +(y+4)^2 - 3 '''
+
+    def __init__(self):
+        super(Paraboloid, self).__init__()
+
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=0.0)
+
+        self.add_output('f_xy', shape=1)
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        ''' f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3 '''
+
+        x = params['x']
+        y = params['y']
+
+        unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+
+# 'StreamingSqliteRecorder' Recorder
+class StreamingSqliteRecorder(BaseRecorder):
+    ''' Records each iteration as one row of a flat sqlite table - a 'case_id' column, a 'success' column and one column per recorded unknown
+    (one per element for array unknowns). record_iteration copies the row out of the model and puts it on a queue of at most queue_size
+    rows; a background thread writes the rows and commits every commit_every of them. When the writer falls behind, the driver waits
+    instead of the queue growing, so the recorder holds at most queue_size rows however long the study runs. '''
+
+    def __init__(self, filename, queue_size=256, commit_every=10000):
+        super(StreamingSqliteRecorder, self).__init__()
+
+        self.options['record_params'] = False
+        self.options['record_resids'] = False
+        self.options['record_metadata'] = False
+
+        self.filename = filename  # self.out stays None - BaseRecorder.close() would close it
+        self.commit_every = commit_every
+
+        self._columns = None  # [(unknown, slice into the row)]
+        self._queue = Queue(maxsize=queue_size)
+        self._writer = None
+        self._error = None  # an exception raised by the writer, re-raised in the driver's thread
+
+    def startup(self, group):
+        super(StreamingSqliteRecorder, self).startup(group)
+
+        # Column layout: every recorded, non pass-by-object unknown, in the model's order
+        includes, excludes = self.options['includes'], self.options['excludes']
+        names = []
+        self._columns = []
+        width = 0
+        for name in group.unknowns.keys():
+            meta = group.unknowns.metadata(name)
+            if meta.get('pass_by_obj') or not any(fnmatch(name, p) for p in includes) or any(fnmatch(name, p) for p in excludes):
+                continue
+            size = meta['size']
+            self._columns.append((name, slice(width, width + size)))
+            names += [name] if size == 1 else ['{}[{}]'.format(name, i) for i in range(size)]
+            width += size
+        self._width = width
+
+        columns = ', '.join('"{}" REAL'.format(name) for name in names)
+        self._insert = 'INSERT OR REPLACE INTO cases VALUES ({})'.format(', '.join(['?']*(len(names) + 2)))
+        conn = sqlite3.connect(self.filename)
+        conn.executescript('DROP TABLE IF EXISTS cases; CREATE TABLE cases (case_id INTEGER PRIMARY KEY, success INTEGER, {});'.format(columns))
+        conn.close()
+
+        self._writer = threading.Thread(target=self._write_rows)
+        self._writer.daemon = True
+        self._writer.start()
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        if self._error is not None:
+            raise self._error
+
+        row = np.empty(self._width)
+        for name, columns in self._columns:
+            row[columns] = unknowns[name]
+        self._queue.put((metadata['coord'][-1][0], metadata.get('success', 1), row))  # blocks while the writer is queue_size rows behind
+
+    def _write_rows(self):
+        conn = sqlite3.connect(self.filename)  # sqlite connections stay in the thread that made them
+        try:
+            pending = 0
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    break
+                case, success, row = item
+                conn.execute(self._insert, [case, success] + row.tolist())
+                pending += 1
+                if pending >= self.commit_every:
+                    conn.commit()
+                    pending = 0
+            conn.commit()
+        except Exception as error:
+            self._error = error
+            while self._queue.get() is not None:  # keep draining so the driver never blocks on a dead writer
+                pass
+        finally:
+            conn.close()
+
+    def record_metadata(self, group):
+        pass
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+    def close(self):
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+        super(StreamingSqliteRecorder, self).close()
+        if self._error is not None:
+            raise self._error
+
+# 'StreamingFullFactorialDriver' Driver
+class StreamingFullFactorialDriver(FullFactorialDriver):
+    ''' FullFactorialDriver that never holds more than the case it is running: cases are taken one at a time from the runlist generator,
+    evaluated on the study's one Problem, recorded, and dropped, so memory stays flat from the first case to the millionth. Use it with
+    recorders that don't keep cases either, like StreamingSqliteRecorder, and without recorders inside SubProblems - their records
+    would grow with the study. worker/num_workers evaluate every num_workers-th case starting at case worker, so independent processes
+    can split one study without a list of cases ever being built or sent; every case keeps its index in the full study. '''
+
+    def __init__(self, num_levels=1, worker=0, num_workers=1, report_every=None):
+        super(StreamingFullFactorialDriver, self).__init__(num_levels=num_levels)
+
+        self.options.add_option('worker', worker, lower=0, desc='Index of this process among num_workers')
+        self.options.add_option('num_workers', num_workers, lower=1, desc='Number of processes splitting the study')
+        self.options.add_option('report_every', report_every, desc='Print progress and memory every this many cases (None - never)')
+
+    def run(self, problem):
+        ''' Evaluates this worker's share of the full factorial, one case at a time. '''
+
+        self.iter_count = 0
+        worker, num_workers = self.options['worker'], self.options['num_workers']
+        cases = islice(self._build_runlist(), worker, None, num_workers)  # the runlist is a generator - nothing is materialized
+
+        start = time.time()
+        for j, run in enumerate(cases):
+            i = worker + j*num_workers  # index in the full study
+            for name, value in run:
+                meta = self._desvars[name]
+                self.root.unknowns[name] = np.asarray(value)/meta['scaler'] - meta['adder']
+
+            metadata = create_local_meta(None, 'Driver')
+            update_local_meta(metadata, (i,))
+            with self.root._dircontext:
+                terminate, exc = self._try_case(self.root, metadata)  # an AnalysisError is recorded with success=0; anything else stops the study
+            if exc is not None:
+                six.reraise(*exc)
+            self.recorders.record_iteration(self.root, metadata)
+            self.iter_count += 1
+
+            if self.options['report_every'] and self.iter_count % self.options['report_every'] == 0:
+                print('{:>10d} cases {:>8.1f} s   peak RSS {}'.format(self.iter_count, time.time()-start, peak_rss()))
+
+# Peak resident memory of this process, for watching that it stays flat
+def peak_rss():
+    if resource is None:
+        return 'unknown'
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return '{:.1f} MB'.format(peak/(1024.0**2 if sys.platform == 'darwin' else 1024.0))  # bytes on macOS, kB on Linux
+
+if __name__ == '__main__':
+
+    # Split the study between processes: `python paraboloid_parameterstudy_streaming_v1.py --worker=0 --workers=4` ... `--worker=3 --workers=4`
+    options = dict(arg[2:].split('=', 1) for arg in sys.argv[1:] if arg.startswith('--') and '=' in arg)
+    worker, num_workers = int(options.get('worker', 0)), int(options.get('workers', 1))
+
+    # Instantiate a top-level Problem 'ParaboloidParameterStudy'
+    # Instantiate a Group and add it to ParaboloidParameterStudy
+    ParaboloidParameterStudy = Problem()
+    ParaboloidParameterStudy.root = Group()
+
+    # Initialize x and y as IndepVarComps and add them to ParaboloidParameterStudy's root group
+    ParaboloidParameterStudy.root.add('p1', IndepVarComp('x', 0.0))
+    ParaboloidParameterStudy.root.add('p2', IndepVarComp('y', 0.0))
+
+    # Add the 'Paraboloid' Component and an ExecComp constraint
+    ParaboloidParameterStudy.root.add('Paraboloid', Paraboloid())
+    ParaboloidParameterStudy.root.add('Constraint', ExecComp('c = -x + y', x=0.0, y=0.0))
+
+    ParaboloidParameterStudy.root.connect('p1.x', ['Paraboloid.x', 'Constraint.x'])
+    ParaboloidParameterStudy.root.connect('p2.y', ['Paraboloid.y', 'Constraint.y'])
+
+    # Add driver
+    # 1001 x 1001 = 1,002,001 cases
+    ParaboloidParameterStudy.driver = StreamingFullFactorialDriver(num_levels=1001, worker=worker, num_workers=num_workers,
+                                                                   report_every=100000)
+
+    # Add design variables and objectives to the parameter study driver
+    ParaboloidParameterStudy.driver.add_desvar('p1.x', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_desvar('p2.y', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_objective('Paraboloid.f_xy')
+    ParaboloidParameterStudy.driver.add_constraint('Constraint.c', upper=-15.0)
+
+
+    # Data collection - one file per worker
+    out = 'record_results_stream.db' if num_workers == 1 else 'record_results_stream_{}.db'.format(worker)
+    recorder = StreamingSqliteRecorder(out)
+    ParaboloidParameterStudy.driver.add_recorder(recorder)
+
+    # Setup
+    ParaboloidParameterStudy.setup(check=False)
+
+    # Run
+    start = time.time()
+    ParaboloidParameterStudy.run()
+
+    # Cleanup - flushes the recorder
+    ParaboloidParameterStudy.cleanup()
+    print('{} cases in {:.1f} s, peak RSS {}'.format(ParaboloidParameterStudy.driver.iter_count, time.time()-start, peak_rss()))
+
+    # Data retrieval & display - the best feasible cases, straight from sqlite
+    conn = sqlite3.connect(out)
+    rows = conn.execute('SELECT case_id, "p1.x", "p2.y", "Paraboloid.f_xy", "Constraint.c" FROM cases '
+                        'WHERE "Constraint.c" <= -15.0 ORDER BY "Paraboloid.f_xy" LIMIT 5').fetchall()
+    pprint(rows)
+    conn.close()
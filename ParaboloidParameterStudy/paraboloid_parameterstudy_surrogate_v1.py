@@ -0,0 +1,302 @@
+'''
+# Name: paraboloid_parameterstudy_surrogate_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Dense parameter study of a paraboloid encapsulated within a SubProblem in OpenMDAO, answered from a surrogate model of the
+#           SubProblem's unknowns. The real SubProblem only runs where the surrogate isn't confident enough.
+#           Adaption of OpenMDAO tutorial: http://openmdao.readthedocs.io/en/1.7.3/usr-guide/tutorials/paraboloid-tutorial.html
+
+# Inputs:
+
+# Outputs:
+'''
+
+from __future__ import print_function
+from openmdao.api import IndepVarComp, Component, Problem, Group
+from openmdao.api import FullFactorialDriver  # FullFactorialDriver driver
+from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
+from openmdao.api import SubProblem  # Allows for nested drivers - not currently supported in OpenMETA - Introduced in OpenMDAO v.1.7.2.
+from openmdao.api import SqliteRecorder  # Recorder
+from openmdao.api import KrigingSurrogate, ResponseSurface, NearestNeighbor  # Surrogate models
+from openmdao.components.subproblem import _reraise  # Prefixes an error with the SubProblem it came from, as SubProblem does
+import sqlitedict  
+import numpy as np
+import sys
+from pprint import pprint
+
+# 'Paraboloid' Component
+class Paraboloid(Component):
+    ''' Evaluates the equation f(x,y) = (x-3)^2 +xy +(y+4)^2 - 3 '''
+
+    def __init__(self):
+        super(Paraboloid, self).__init__()
+        
+        self.add_param('x', val=0.0)
+        self.add_param('y', val=0.0)
+        
+        self.add_output('f_xy', shape=1)
+        
+    def solve_nonlinear(self, params, unknowns, resids):
+        ''' f(x,y) = (x-3)^2 + xy + (y+4)^2 - 3 '''
+        
+        x = params['x']
+        y = params['y']
+        
+        unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+
+# Surrogate models for the Parameter Study driver's "SurrogateType" detail in mdao_config.json
+# Every type is cross-validated on its training runs before it is trusted; Kriging is also checked against its own error estimate at each point.
+SURROGATES = {
+    'Kriging': lambda: KrigingSurrogate(eval_rmse=True),
+    'ResponseSurface': ResponseSurface,
+    'NearestNeighbor': lambda: NearestNeighbor(interpolant_type='rbf'),
+}
+
+# 'SurrogateSubProblem' SubProblem
+class SurrogateSubProblem(SubProblem):
+    ''' SubProblem whose unknowns come from a surrogate model trained on its own earlier runs. With bounds ({param: (lower, upper)}),
+    the first case starts by running the real Problem at num_train Latin hypercube points spread over those bounds; without, the first
+    num_train cases use the real Problem - and a DOE's first cases are usually bunched along one edge of its space. Each fit is cross-validated: every num_folds-th run is held out in turn, predicted by a surrogate trained on the
+    rest, and the surrogate is only trusted while its worst held-out error is within threshold, relative to the range of that unknown
+    seen so far. A trusted Kriging model is also bypassed wherever its own predicted error is above threshold. The extra unknown
+    'from_surrogate' is 1.0 when a case was answered by the surrogate and 0.0 when the real Problem ran. Real runs are added to the
+    training data, and the surrogates are refit in batches: after refit_every new runs, or refit_growth times the training set if that
+    is more. A Kriging fit costs O(n^3) in the number of runs, so refitting after every run - or every fixed number of runs - would
+    soon dominate the study. '''
+
+    def __init__(self, problem, params=(), unknowns=(), surrogate_type='ResponseSurface', num_train=10, threshold=1.0e-2, refit_every=10,
+                 refit_growth=0.25, num_folds=5, bounds=None, seed=0):
+        super(SurrogateSubProblem, self).__init__(problem, params=params, unknowns=unknowns)
+
+        self._surrogate_params = list(params)
+        self._surrogate_unknowns = list(unknowns)
+        self._new_surrogate = SURROGATES[surrogate_type]
+        self._surrogates = [self._new_surrogate() for name in unknowns]
+        self.num_train = num_train
+        self.threshold = threshold  # predicted error / range of the unknown
+        self.refit_every = refit_every
+        self.refit_growth = refit_growth
+        self.num_folds = num_folds
+        self.bounds = bounds
+        self.seed = seed
+        self._scale = None  # range of each unknown over the training data
+        self._fitted = 0  # number of runs the surrogates were last trained on
+        self._trusted = False  # whether the last fit passed cross-validation
+        self.validation_error = None  # worst held-out error of each unknown at the last fit, relative to its range
+
+        self._x = []  # params of every real run
+        self._y = []  # unknowns of every real run
+        self.true_runs = 0
+        self.surrogate_runs = 0
+
+    def _setup_variables(self):
+        ''' Adds the 'from_surrogate' unknown to the ones exposed from the Problem. '''
+
+        params_dict, unknowns_dict = super(SurrogateSubProblem, self)._setup_variables()
+
+        pathname = self._get_var_pathname('from_surrogate')
+        unknowns_dict[pathname] = {'shape': 1, 'val': 0.0, 'size': 1, 'pathname': pathname}
+        self._sysdata.to_prom_uname[pathname] = 'from_surrogate'
+        self._sysdata.to_prom_name[pathname] = 'from_surrogate'
+        self._sysdata.to_abs_uname['from_surrogate'] = pathname
+
+        return params_dict, unknowns_dict
+
+    def _get_relname_map(self, parent_proms):
+        ''' Maps 'from_surrogate' into the parent's vectors along with the Problem's unknowns. '''
+
+        umap = super(SurrogateSubProblem, self)._get_relname_map(parent_proms)
+        pkey = '.'.join((self.name, 'from_surrogate'))
+        if pkey in parent_proms:
+            umap[parent_proms[pkey]] = 'from_surrogate'
+        return umap
+
+    def _run_problem(self, params, unknowns, resids):
+        ''' SubProblem.solve_nonlinear, except that 'from_surrogate' isn't copied from the Problem - it has no such unknown. '''
+
+        try:
+            prob = self._problem
+            for name in self._prob_params:
+                prob[name] = params[name]
+
+            prob.run()
+
+            for name in self._prob_unknowns:
+                unknowns[name] = prob.root.unknowns[name]
+                resids[name] = prob.root.resids[name]
+
+            for name in self._unknowns_as_params:
+                params[name] = prob.root.unknowns[name]
+        except:
+            _reraise(self.pathname, sys.exc_info())
+        unknowns['from_surrogate'] = 0.0
+
+    def _train_on_sample(self):
+        ''' Runs the real Problem at num_train Latin hypercube points within bounds and learns from them. '''
+
+        rng = np.random.RandomState(self.seed)
+        lower = np.array([self.bounds[name][0] for name in self._surrogate_params], dtype=float)
+        upper = np.array([self.bounds[name][1] for name in self._surrogate_params], dtype=float)
+        strata = np.array([rng.permutation(self.num_train) for name in self._surrogate_params]).T  # one point per stratum of each param
+        prob = self._problem
+        for x in lower + (strata + rng.rand(*strata.shape))/self.num_train*(upper - lower):
+            try:
+                for name, value in zip(self._surrogate_params, x):
+                    prob[name] = value
+                prob.run()
+            except:
+                _reraise(self.pathname, sys.exc_info())
+            self.true_runs += 1
+            self._learn(x, [float(prob.root.unknowns[name]) for name in self._surrogate_unknowns])
+
+    def _learn(self, x, y):
+        ''' Adds a real run to the training data, and refits and cross-validates the surrogates when a batch is due. '''
+
+        self._x.append(x)
+        self._y.append(y)
+        if len(self._x) >= max(self.num_train, self._fitted + max(self.refit_every, int(self.refit_growth*self._fitted))):
+            x_train = np.array(self._x)
+            y_train = np.array(self._y)
+            self._scale = np.maximum(y_train.max(axis=0) - y_train.min(axis=0), np.finfo(float).tiny)
+            for j, surrogate in enumerate(self._surrogates):
+                surrogate.train(x_train, y_train[:, j:j+1])
+            self.validation_error = self._cross_validate(x_train, y_train)/self._scale
+            self._trusted = bool(np.all(self.validation_error <= self.threshold))
+            self._fitted = len(self._x)
+
+    def _cross_validate(self, x_train, y_train):
+        ''' Worst error of each unknown over num_folds held-out folds of the training runs, each predicted by a fresh surrogate
+        trained on the other folds. '''
+
+        error = np.zeros(y_train.shape[1])
+        for k in range(self.num_folds):
+            held_out = np.arange(k, len(x_train), self.num_folds)  # interleaved, so no fold is a whole corner of the sweep
+            kept = np.setdiff1d(np.arange(len(x_train)), held_out)
+            for j in range(y_train.shape[1]):
+                surrogate = self._new_surrogate()
+                surrogate.train(x_train[kept], y_train[kept, j:j+1])
+                for i in held_out:
+                    prediction = surrogate.predict(x_train[i])
+                    if isinstance(prediction, tuple):
+                        prediction = prediction[0]
+                    error[j] = max(error[j], abs(float(np.asarray(prediction).flat[0]) - y_train[i, j]))
+        return error
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        if not self.is_active():
+            return
+
+        if self.bounds is not None and not self._x:
+            self._train_on_sample()
+
+        x = np.array([float(params[name]) for name in self._surrogate_params])
+
+        if self._trusted:
+            values = []
+            for surrogate, scale in zip(self._surrogates, self._scale):
+                prediction = surrogate.predict(x)
+                if isinstance(prediction, tuple):  # (value, rmse) from surrogates that estimate their own error
+                    prediction, rmse = prediction
+                    if float(np.max(rmse)) > self.threshold*scale:
+                        break
+                values.append(float(np.asarray(prediction).flat[0]))
+            else:
+                for name, value in zip(self._surrogate_unknowns, values):
+                    unknowns[name] = value
+                unknowns['from_surrogate'] = 1.0
+                self.surrogate_runs += 1
+                return
+
+        # Not enough training data yet, the surrogate failed cross-validation, or it isn't confident here - run the real Problem
+        # and learn from it
+        self._run_problem(params, unknowns, resids)
+        self.true_runs += 1
+        self._learn(x, [float(unknowns[name]) for name in self._surrogate_unknowns])
+
+if __name__ == '__main__':
+
+    # Instantiate a sub-level Problem 'paraboloidProblem'.
+    # Instantiate a Group and add it to paraboloidProblem.
+    paraboloidProblem = Problem()
+    paraboloidProblem.root = Group()
+    
+    # Add the 'Paraboloid' Component to paraboloidProblem's root Group.
+    paraboloidProblem.root.add('Paraboloid', Paraboloid())
+    
+    # Initialize x and y values in seperate IndepVarComps and add them to paraboloidProblem's root group
+    # These are added for the two Problem Inputs 'x' and 'y'
+    paraboloidProblem.root.add('p1', IndepVarComp('x', 0.0))
+    paraboloidProblem.root.add('p2', IndepVarComp('y', 0.0))
+    
+    # Connect the IndepVarComps 'p1.x' and 'p2.y' to 'T.Paraboloid.x' and 'T.Paraboloid.y' respectively
+    paraboloidProblem.root.connect('p1.x', 'Paraboloid.x')
+    paraboloidProblem.root.connect('p2.y', 'Paraboloid.y')
+
+    # Paraboloid has no explicitly declared driver
+    
+    
+    # Instantiate a top-level Problem 'ParaboloidParameterStudy'
+    # Instantiate a Group and add it to ParaboloidParameterStudy
+    ParaboloidParameterStudy = Problem()
+    ParaboloidParameterStudy.root = Group()
+    
+    # Initialize x and y as IndepVarComps and add them to ParaboloidParameterStudy's root group
+    ParaboloidParameterStudy.root.add('p1', IndepVarComp('x', 0.0)) 
+    ParaboloidParameterStudy.root.add('p2', IndepVarComp('y', 0.0)) 
+    
+    # Add paraboloidProblem to ParaboloidParameterStudy as a SubProblem called 'ParaboloidProblem' 
+    # Include paraboloidProblem's Problem Inputs and Problem Outputs in 'params' and 'unknowns' fields SubProblem 
+    # 'SurrogateType': 'ResponseSurface' - ParaboloidProblem is first run at 10 Latin hypercube points over the study's bounds, and
+    # answered from a quadratic response surface for as long as its cross-validated error is under 1% of the range of f_xy.
+    # The model is refit once the real runs since the last fit reach 10 or a quarter of the training set, whichever is more.
+    surrogateSubProblem = SurrogateSubProblem(paraboloidProblem, params=['p1.x', 'p2.y'],
+                                            unknowns=['Paraboloid.f_xy'],  # This is where you designate what to expose to the outside world
+                                            surrogate_type='ResponseSurface', num_train=10, threshold=1.0e-2, refit_every=10,
+                                            refit_growth=0.25, bounds={'p1.x': (-50, 50), 'p2.y': (-50, 50)})
+    ParaboloidParameterStudy.root.add('ParaboloidProblem', surrogateSubProblem)
+    
+    # Connect ParaboloidParameterStudy's IndepVarComps to ParaboloidProblem's params
+    ParaboloidParameterStudy.root.connect('p1.x', 'ParaboloidProblem.p1.x')
+    ParaboloidParameterStudy.root.connect('p2.y', 'ParaboloidProblem.p2.y')
+    
+    # Add driver
+    # A much denser sweep than FullFactorialDriver(num_levels=11) - most of these points never run ParaboloidProblem
+    ParaboloidParameterStudy.driver = FullFactorialDriver(num_levels=41)
+    
+    # Add design variables and objectives to the parameter study driver
+    ParaboloidParameterStudy.driver.add_desvar('p1.x', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_desvar('p2.y', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_objective('ParaboloidProblem.Paraboloid.f_xy')
+    
+    
+    # Data collection
+    recorder = SqliteRecorder('record_results')
+    recorder.options['record_params'] = True
+    recorder.options['record_metadata'] = True
+    ParaboloidParameterStudy.driver.add_recorder(recorder)
+    
+    # Setup
+    ParaboloidParameterStudy.setup(check=False)
+    
+    # Run 
+    ParaboloidParameterStudy.run()
+    
+    # Cleanup
+    ParaboloidParameterStudy.cleanup()
+    
+    print('ParaboloidProblem runs: {} real, {} from the surrogate'.format(surrogateSubProblem.true_runs, surrogateSubProblem.surrogate_runs))
+    print('Cross-validated error: {} of the range of each unknown'.format(surrogateSubProblem.validation_error))
+    
+    # Data retrieval & display
+    # Old way - good for debugging IndepVars
+    db = sqlitedict.SqliteDict( 'record_results', 'iterations' )
+    db_keys = list( db.keys() ) # list() needed for compatibility with Python 3. Not needed for Python 2
+    for i in db_keys:
+        data = db[i]
+        print('\n')
+        print(data['Unknowns'])
+        print(data['Parameters'])
\ No newline at end of file
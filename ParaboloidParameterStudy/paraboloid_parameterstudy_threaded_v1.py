@@ -0,0 +1,197 @@
+'''
+# Name: paraboloid_parameterstudy_threaded_v1.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: Parameter study of I/O-bound wrapper components (like the PythonWrapper components in OpenMETA PETs) using threads instead of
+#           processes - independent components in a Group run at the same time, and so do independent cases of the DOE.
+#           Adaption of OpenMDAO tutorial: http://openmdao.readthedocs.io/en/1.7.3/usr-guide/tutorials/paraboloid-tutorial.html
+
+# Inputs:
+
+# Outputs:
+'''
+
+from __future__ import print_function
+from openmdao.api import IndepVarComp, Component, Problem, Group
+from openmdao.api import FullFactorialDriver  # FullFactorialDriver driver
+from openmdao.api import ExecComp  # 'Quick Component' - useful for creating constraints
+from openmdao.api import SqliteRecorder  # Recorder
+from openmdao.util.record_util import create_local_meta, update_local_meta
+from multiprocessing.pool import ThreadPool  # Thread pool in both Python 2 and Python 3
+import threading
+import sqlitedict
+import numpy as np
+import time
+try:
+    from queue import Queue  # Python 3
+except ImportError:
+    from Queue import Queue  # Python 2
+from pprint import pprint
+
+# 'ExternalTool' Component
+class ExternalTool(ExecComp):
+    ''' Stand-in for a PythonWrapper component that runs an external tool: evaluates its expression after waiting latency seconds,
+    the way a wrapper waits on a tool's process or output files. The wait doesn't hold the GIL, so threads overlap it. '''
+
+    def __init__(self, exprs, latency=0.05, **kwargs):
+        super(ExternalTool, self).__init__(exprs, **kwargs)
+        self.latency = latency
+
+    def solve_nonlinear(self, params, unknowns, resids):
+        time.sleep(self.latency)
+        super(ExternalTool, self).solve_nonlinear(params, unknowns, resids)
+
+# 'ThreadedGroup' Group
+class ThreadedGroup(Group):
+    ''' Group whose subsystems run at the same time in a thread pool - the threaded counterpart of ParallelGroup. Like ParallelGroup,
+    its subsystems must not depend on each other. Every subsystem gets its inputs before any of them runs. Subsystems must not have
+    their own directory, since the working directory is shared by all threads. The pool is closed at cleanup(). '''
+
+    def __init__(self, num_threads=None):
+        super(ThreadedGroup, self).__init__()
+        self.num_threads = num_threads  # None - one thread per subsystem
+        self._pool = None  # started on the first run
+
+    def children_solve_nonlinear(self, metadata):
+        ''' Group.children_solve_nonlinear, with the subsystems solved in the thread pool. '''
+
+        subs = list(self._subsystems.values())
+        for sub in subs:
+            self._transfer_data(sub.name)
+
+        def solve(sub):
+            with sub._dircontext:
+                if isinstance(sub, Component):
+                    sub._sys_solve_nonlinear(sub.params, sub.unknowns, sub.resids)
+                else:
+                    sub.solve_nonlinear(sub.params, sub.unknowns, sub.resids, metadata)
+
+        if self._pool is None:
+            self._pool = ThreadPool(self.num_threads or max(len(subs), 1))
+        self._pool.map(solve, [sub for sub in subs if sub.is_active()])
+
+    def cleanup(self):
+        super(ThreadedGroup, self).cleanup()
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+
+# 'ThreadedFullFactorialDriver' Driver
+class ThreadedFullFactorialDriver(FullFactorialDriver):
+    ''' FullFactorialDriver that keeps num_threads cases in flight at once in a thread pool. Every thread evaluates its cases on its own
+    Problem - the study's, or a copy built from the same model function - so no Group, SubProblem or vector is ever shared between two
+    running cases. Recording is serialized with a lock, so any recorder can be used. Components must not change the working directory,
+    since it is shared by all threads. '''
+
+    def __init__(self, model, num_levels=1, num_threads=4):
+        super(ThreadedFullFactorialDriver, self).__init__(num_levels=num_levels)
+
+        self.options.add_option('num_threads', num_threads, lower=1, desc='Number of cases evaluated at the same time')
+        self._model = model  # function that builds a fresh copy of the study's root Group
+        self._record_lock = threading.Lock()
+
+    def run(self, problem):
+        ''' Evaluates every case of the full factorial, num_threads at a time. '''
+
+        problems = Queue()
+        problems.put(problem)
+        copies = []
+        for i in range(self.options['num_threads'] - 1):
+            copy = Problem(root=self._model())
+            copy.setup(check=False)
+            problems.put(copy)
+            copies.append(copy)
+
+        def run_case(case):
+            i, run = case
+            worker = problems.get()
+            try:
+                for name, value in run:
+                    meta = self._desvars[name]
+                    worker.root.unknowns[name] = np.asarray(value)/meta['scaler'] - meta['adder']
+
+                metadata = create_local_meta(None, 'Driver')
+                update_local_meta(metadata, (i,))
+                with worker.root._dircontext:
+                    worker.root.solve_nonlinear(metadata=metadata)
+
+                with self._record_lock:
+                    self.recorders.record_iteration(worker.root, metadata)
+            finally:
+                problems.put(worker)
+
+        pool = ThreadPool(self.options['num_threads'])
+        try:
+            cases = list(enumerate(self._build_runlist()))
+            pool.map(run_case, cases, chunksize=1)
+        finally:
+            pool.close()
+            pool.join()
+            for copy in copies:
+                copy.cleanup()  # the study's own Problem is cleaned up by its caller
+        self.iter_count = len(cases)
+
+# The study's root Group. ThreadedFullFactorialDriver builds one copy of it per extra thread.
+def build_model():
+    root = Group()
+
+    # Initialize x and y as IndepVarComps and add them to the root group
+    root.add('p1', IndepVarComp('x', 0.0))
+    root.add('p2', IndepVarComp('y', 0.0))
+
+    # Two wrappers that don't depend on each other, so 'Tools' can run them at the same time
+    tools = root.add('Tools', ThreadedGroup())
+    tools.add('Paraboloid', ExternalTool('f_xy = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0', x=0.0, y=0.0))
+    tools.add('Constraint', ExternalTool('c = -x + y', x=0.0, y=0.0))
+
+    root.connect('p1.x', ['Tools.Paraboloid.x', 'Tools.Constraint.x'])
+    root.connect('p2.y', ['Tools.Paraboloid.y', 'Tools.Constraint.y'])
+    return root
+
+if __name__ == '__main__':
+
+    # Instantiate a top-level Problem 'ParaboloidParameterStudy'
+    ParaboloidParameterStudy = Problem(root=build_model())
+
+    # Add driver
+    # Up to 8 cases in flight at once, each running its two wrappers at the same time
+    ParaboloidParameterStudy.driver = ThreadedFullFactorialDriver(build_model, num_levels=11, num_threads=8)
+
+    # Add design variables and objectives to the parameter study driver
+    ParaboloidParameterStudy.driver.add_desvar('p1.x', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_desvar('p2.y', lower=-50, upper=50)
+    ParaboloidParameterStudy.driver.add_objective('Tools.Paraboloid.f_xy')
+    ParaboloidParameterStudy.driver.add_constraint('Tools.Constraint.c', upper=-15.0)
+
+
+    # Data collection
+    recorder = SqliteRecorder('record_results')
+    recorder.options['record_params'] = True
+    recorder.options['record_metadata'] = True
+    ParaboloidParameterStudy.driver.add_recorder(recorder)
+
+    # Setup
+    ParaboloidParameterStudy.setup(check=False)
+
+    # Run
+    start = time.time()
+    ParaboloidParameterStudy.run()
+    print('121 cases x 2 wrappers in {:.2f} s (serially: about {:.2f} s)'.format(time.time()-start, 121*2*0.05))
+
+    # Cleanup
+    ParaboloidParameterStudy.cleanup()
+
+    # Data retrieval & display
+    # Old way - good for debugging IndepVars
+    db = sqlitedict.SqliteDict( 'record_results', 'iterations' )
+    db_keys = list( db.keys() ) # list() needed for compatibility with Python 3. Not needed for Python 2
+    for i in db_keys:
+        data = db[i]
+        print('\n')
+        print(data['Unknowns'])
+        print(data['Parameters'])
@@ -22,6 +22,8 @@ from openmdao.api import ExecComp  # 'Quick Component' - useful for creating con
 from openmdao.api import SubProblem  # Allows for nested drivers - not currently supported in OpenMETA - Introduced in OpenMDAO v.1.7.2.
 from openmdao.api import SqliteRecorder  # Recorder
 import sqlitedict  
+import numpy as np
+from csv_recorder import DriverCsvRecorder  # Recorder - see csv_recorder.py
 from pprint import pprint
 
 # First, let's create the component defining our system. We'll call it 'Paraboloid'.
@@ -43,6 +45,60 @@ class Paraboloid(Component):
         y = params['y']
         
         unknowns['f_xy'] = (x-3.0)**2 + x*y + (y+4.0)**2 - 3.0
+
+# ScipyOptimizer that enforces the add_desvar(lower, upper) bounds for every SciPy method
+class BoundedScipyOptimizer(ScipyOptimizer):
+    ''' ScipyOptimizer that maps desvar bounds onto each SciPy method's native form and never evaluates out-of-range points '''
+
+    def __init__(self):
+        super(BoundedScipyOptimizer, self).__init__()
+
+        self._bound_cons = set()  # constraints added here on behalf of the desvar bounds
+
+    def _setup(self):
+        # COBYLA ignores bounds, so express each desvar range in COBYLA's native form: a pair of inequality constraints.
+        # 'L-BFGS-B', 'TNC' and 'SLSQP' already receive the bounds from ScipyOptimizer.
+        if self.options['optimizer'] == 'COBYLA':
+            for name, meta in list(self._desvars.items()):
+                if name not in self._cons:
+                    self.add_constraint(name, lower=meta['lower']/meta['scaler'] - meta['adder'],
+                                              upper=meta['upper']/meta['scaler'] - meta['adder'])
+                    self._bound_cons.add(name)
+
+        super(BoundedScipyOptimizer, self)._setup()
+
+    def run(self, problem):
+        # Flatten the desvar bounds into the same order SciPy uses for its design vector
+        self._desvar_offsets = {}
+        lower, upper = [], []
+        for name, meta in self.get_desvar_metadata().items():
+            self._desvar_offsets[name] = len(lower)
+            lower.extend(np.resize(meta['lower'], meta['size']))
+            upper.extend(np.resize(meta['upper'], meta['size']))
+        self._lower = np.array(lower)
+        self._upper = np.array(upper)
+
+        super(BoundedScipyOptimizer, self).run(problem)
+
+    def _objfunc(self, x_new):
+        # Project out-of-range trial points back onto the desvar box before the model is evaluated
+        return super(BoundedScipyOptimizer, self)._objfunc(np.clip(x_new, self._lower, self._upper))
+
+    def _confunc(self, x_new, name, idx):
+        # ScipyOptimizer names the upper side of a double-sided constraint '2bl-<name>'
+        dbl = name.startswith('2bl-')
+        if (name[4:] if dbl else name) not in self._bound_cons:
+            return super(BoundedScipyOptimizer, self)._confunc(x_new, name, idx)
+        name = name[4:] if dbl else name
+
+        # Bound constraints are evaluated on the unclipped trial point so COBYLA still sees the violation.
+        # Note, scipy defines constraints to be satisfied when positive, which is the opposite of OpenMDAO.
+        meta = self._cons[name]
+        desvar = self._desvars[name]
+        val = x_new[self._desvar_offsets[name] + idx]/desvar['scaler'] - desvar['adder']
+        if meta['lower'] is None or dbl:
+            return meta['upper'] - val
+        return val - meta['lower']
         
 if __name__ == '__main__':
 
@@ -70,7 +126,7 @@ if __name__ == '__main__':
     sub.root.connect('p2.y', 'P.y')
 
     # Instantiate sub's optimization driver
-    sub.driver = ScipyOptimizer()
+    sub.driver = BoundedScipyOptimizer()  # desvar bounds are enforced for every SciPy method, including COBYLA
     
     # Modify the optimization driver's settings
     sub.driver.options['optimizer'] = 'COBYLA'  # Type of Optimizer. 'COBYLA' does not require derivatives
@@ -83,10 +139,8 @@ if __name__ == '__main__':
     sub.driver.add_desvar('p1.x', lower=-50, upper=50)
     sub.driver.add_objective('P.f_xy')
     sub.driver.add_constraint('con.c', lower=15.0)
-    sub.driver.add_constraint('p1.x', lower=-50.0, upper=50.0)  # Note adding this while this variable constraint reduces the degree to which
-                                                                # the constraint is violated, it does not eliminate the violation
-    # ^ Jonathan comments that you often have to add constraints for the design variable ranges since the design variable bounds
-    # are either not passed along to SciPy or are not enforced.    
+    # No add_constraint('p1.x', lower=-50.0, upper=50.0) needed - BoundedScipyOptimizer passes the desvar bounds to
+    # COBYLA as constraints and clips trial points to the bounds before the model is evaluated.
     
     # Instantiate a top-level Problem 'top'
     # Instantiate a Group and add it to sub
@@ -114,6 +168,7 @@ if __name__ == '__main__':
     recorder.options['record_params'] = True
     recorder.options['record_metadata'] = True
     top.driver.add_recorder(recorder)
+    top.driver.add_recorder(DriverCsvRecorder('output.csv', include_id=True))  # The recorder mockup_mdao_config.json asks for
     
     # Setup
     top.setup(check=False)
@@ -132,4 +187,9 @@ if __name__ == '__main__':
         data = db[i]
         print('\n')
         print(data['Unknowns'])
-        print(data['Parameters'])
\ No newline at end of file
+        print(data['Parameters'])
+
+    # CSV - one row per iteration, one column per unknown
+    with open('output.csv') as f_in:
+        print('\n')
+        print(f_in.read())
\ No newline at end of file
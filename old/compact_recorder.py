@@ -0,0 +1,173 @@
+'''
+# Name: compact_recorder.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: CompactSqliteRecorder - a SqliteRecorder replacement that writes variable metadata once and packs each iteration's values,
+#           and CompactCaseReader to read its files back. Used by NewPETOpenMDAO_v2.py.
+
+# Inputs:
+
+# Outputs: filename - sqlite file with 'variables', 'iterations' and 'settings' tables
+'''
+
+from __future__ import print_function
+from openmdao.recorders.base_recorder import BaseRecorder
+from openmdao.util.record_util import format_iteration_coordinate
+from fnmatch import fnmatch
+import sqlite3
+import pickle
+import json
+import zlib
+import time
+import numpy as np
+
+# Variable metadata worth keeping in the schema - everything else in a VecWrapper's metadata is internal bookkeeping
+SCHEMA_KEYS = ('pathname', 'top_promoted_name', 'promoted_name', 'shape', 'size', 'units', 'pass_by_obj')
+
+# 'CompactSqliteRecorder' Recorder
+class CompactSqliteRecorder(BaseRecorder):
+    ''' Records iterations to a sqlite file with the variable metadata written once, at setup, to a 'variables' table. Every recorded
+    variable gets a small integer id and a slice of a flat vector, so an iteration row holds only packed numbers: one float64 (or float32)
+    blob per vector, optionally zlib-compressed, instead of a pickled dict of names and metadata. Read the file with CompactCaseReader. '''
+
+    def __init__(self, filename, dtype='float64', compress=False, commit_every=100):
+        super(CompactSqliteRecorder, self).__init__()
+
+        self.filename = filename  # self.out stays None - BaseRecorder.close() would close it
+        self.dtype = np.dtype(dtype)
+        self.compress = compress
+        self.commit_every = commit_every
+        self._pending = 0
+
+        self._conn = sqlite3.connect(filename)
+        self._conn.executescript('''
+            DROP TABLE IF EXISTS variables;
+            DROP TABLE IF EXISTS iterations;
+            DROP TABLE IF EXISTS settings;
+            CREATE TABLE variables (id INTEGER PRIMARY KEY, vector TEXT, name TEXT, start INTEGER, stop INTEGER, meta TEXT);
+            CREATE TABLE iterations (key TEXT PRIMARY KEY, timestamp REAL, success INTEGER, msg TEXT,
+                                     Unknowns BLOB, Parameters BLOB, Residuals BLOB, objects BLOB);
+            CREATE TABLE settings (name TEXT PRIMARY KEY, value TEXT);
+        ''')
+        self._layout = {}  # {vector: ([(name, start, stop)], width)}
+        self._objects = []  # [(vector, name)] of pass-by-object variables, pickled as they are
+
+    def startup(self, group):
+        super(CompactSqliteRecorder, self).startup(group)
+
+        includes, excludes = self.options['includes'], self.options['excludes']
+        vectors = [('Unknowns', group.unknowns, self.options['record_unknowns']),
+                   ('Parameters', group.params, self.options['record_params']),
+                   ('Residuals', group.resids, self.options['record_resids'])]
+        for vector, vec, record in vectors:
+            layout = []
+            width = 0
+            for name in (vec.keys() if record else []):
+                if not any(fnmatch(name, p) for p in includes) or any(fnmatch(name, p) for p in excludes):
+                    continue
+                meta = vec.metadata(name)
+                schema = dict((key, meta[key]) for key in SCHEMA_KEYS if key in meta)
+                if meta.get('pass_by_obj'):
+                    start = stop = None
+                    self._objects.append((vector, name))
+                else:
+                    start, stop = width, width + meta['size']
+                    layout.append((name, start, stop))
+                    width = stop
+                self._conn.execute('INSERT INTO variables (vector, name, start, stop, meta) VALUES (?, ?, ?, ?, ?)',
+                                   (vector, name, start, stop, json.dumps(schema, default=str)))
+            self._layout[vector] = (layout, width)
+
+        self._conn.executemany('INSERT INTO settings (name, value) VALUES (?, ?)',
+                               [('dtype', self.dtype.str), ('compress', json.dumps(self.compress))])
+        self._conn.commit()
+
+    def _pack(self, vector, values):
+        layout, width = self._layout[vector]
+        if values is None or not layout:
+            return None
+        flat = np.empty(width, dtype=self.dtype)
+        for name, start, stop in layout:
+            flat[start:stop] = np.ravel(values[name])
+        data = flat.tobytes()
+        return sqlite3.Binary(zlib.compress(data, 1) if self.compress else data)
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        vectors = {'Unknowns': unknowns, 'Parameters': params, 'Residuals': resids}
+        objects = dict(((vector, name), vectors[vector][name]) for vector, name in self._objects if vectors[vector] is not None)
+
+        self._conn.execute('INSERT OR REPLACE INTO iterations VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
+                           (format_iteration_coordinate(metadata['coord']), metadata.get('timestamp', time.time()),
+                            metadata.get('success', 1), metadata.get('msg', ''),
+                            self._pack('Unknowns', unknowns), self._pack('Parameters', params), self._pack('Residuals', resids),
+                            sqlite3.Binary(pickle.dumps(objects, pickle.HIGHEST_PROTOCOL)) if objects else None))
+        self._pending += 1
+        if self._pending >= self.commit_every:
+            self._conn.commit()
+            self._pending = 0
+
+    def record_metadata(self, group):
+        pass  # the variables table holds it
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.commit()
+            self._conn.close()
+            self._conn = None
+        super(CompactSqliteRecorder, self).close()
+
+# 'CompactCaseReader'
+class CompactCaseReader(object):
+    ''' Reads a CompactSqliteRecorder file. reader[key] returns the same {'Unknowns': {...}, 'Parameters': {...}, ...} layout that
+    sqlitedict.SqliteDict(filename, 'iterations')[key] returns for SqliteRecorder files. '''
+
+    def __init__(self, filename):
+        self._conn = sqlite3.connect(filename)
+        settings = dict(self._conn.execute('SELECT name, value FROM settings'))
+        self.dtype = np.dtype(settings['dtype'])
+        self.compress = json.loads(settings['compress'])
+
+        self.variables = {}  # {vector: [(name, start, stop)]}
+        self.metadata = {}  # {(vector, name): schema}
+        for vector, name, start, stop, meta in self._conn.execute('SELECT vector, name, start, stop, meta FROM variables ORDER BY id'):
+            if start is not None:
+                self.variables.setdefault(vector, []).append((name, start, stop))
+            self.metadata[(vector, name)] = json.loads(meta)
+
+    def keys(self):
+        return [key for key, in self._conn.execute('SELECT key FROM iterations ORDER BY rowid')]
+
+    def _unpack(self, vector, blob):
+        values = {}
+        if blob is None:
+            return values
+        data = zlib.decompress(bytes(blob)) if self.compress else bytes(blob)
+        flat = np.frombuffer(data, dtype=self.dtype)
+        for name, start, stop in self.variables.get(vector, []):
+            shape = self.metadata[(vector, name)].get('shape', 1)
+            values[name] = float(flat[start]) if stop - start == 1 and shape in (1, [1]) else flat[start:stop].reshape(shape)
+        return values
+
+    def __getitem__(self, key):
+        row = self._conn.execute('SELECT timestamp, success, msg, Unknowns, Parameters, Residuals, objects FROM iterations WHERE key = ?',
+                                 (key,)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        timestamp, success, msg = row[:3]
+        data = {'timestamp': timestamp, 'success': success, 'msg': msg}
+        for vector, blob in zip(('Unknowns', 'Parameters', 'Residuals'), row[3:6]):
+            data[vector] = self._unpack(vector, blob)
+        if row[6] is not None:
+            for (vector, name), value in pickle.loads(bytes(row[6])).items():
+                data[vector][name] = value
+        return data
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,131 @@
+'''
+# Name: csv_recorder.py
+# Company: MetaMorph, Inc.
+# Author(s): Joseph Coombe, Timothy Thomas
+# Email: jcoombe@metamorphsoftware.com
+# Create Date: 10/19/2026
+# Edit Date: 10/19/2026
+
+# Tutorial: DriverCsvRecorder - the recorder run_mdao's configs ask for, usable from the OpenMDAO scripts here as well
+#           e.g. top.driver.add_recorder(DriverCsvRecorder('output.csv', include_id=True))
+
+# Inputs:
+
+# Outputs: filename - one CSV row per driver iteration
+'''
+
+from __future__ import print_function
+from openmdao.recorders.base_recorder import BaseRecorder
+from openmdao.util.record_util import format_iteration_coordinate
+from fnmatch import fnmatch
+import threading
+import gzip
+import io
+import numpy as np
+try:
+    from queue import Queue  # Python 3
+except ImportError:
+    from Queue import Queue  # Python 2
+
+# run_mdao's "recorders": [{"type": "DriverCsvRecorder", "filename": "output.csv", "include_id": true}]
+class DriverCsvRecorder(BaseRecorder):
+    ''' Records the driver's iterations to a CSV file, one row per iteration and one column per recorded unknown (one column per
+    element for array unknowns). With include_id the first column is the iteration's id, e.g. 'rank0:Driver|12'.
+
+    The columns are laid out once, at setup. Rows are collected into a block_size x columns array, which a background thread formats
+    with numpy and writes in one piece, so the driver only waits when the writer is a full queue behind. A filename ending in '.gz',
+    or compress=True, writes gzip-compressed CSV. An error in the writer is raised by the next record_iteration() or by close(). '''
+
+    def __init__(self, filename, include_id=False, block_size=1024, compress=False, fmt='%.17g'):
+        super(DriverCsvRecorder, self).__init__()
+
+        self.options['record_params'] = False
+        self.options['record_resids'] = False
+        self.options['record_metadata'] = False
+
+        self.filename = filename  # self.out stays None - BaseRecorder.close() would close it
+        self.include_id = include_id
+        self.block_size = block_size
+        self.compress = compress or filename.endswith('.gz')
+        self.fmt = fmt  # '%.17g' round-trips every float64
+
+        self._columns = None  # [(unknown, slice into the row)]
+        self._block = None
+        self._ids = []
+        self._queue = Queue(maxsize=4)  # blocks waiting for the writer
+        self._writer = None
+        self._error = None  # an exception raised by the writer, re-raised in the driver's thread
+
+    def startup(self, group):
+        super(DriverCsvRecorder, self).startup(group)
+
+        # Column layout: every recorded, non pass-by-object unknown, in the model's order
+        includes, excludes = self.options['includes'], self.options['excludes']
+        names = []
+        self._columns = []
+        width = 0
+        for name in group.unknowns.keys():
+            meta = group.unknowns.metadata(name)
+            if meta.get('pass_by_obj') or not any(fnmatch(name, p) for p in includes) or any(fnmatch(name, p) for p in excludes):
+                continue
+            size = meta['size']
+            self._columns.append((name, slice(width, width + size)))
+            names += [name] if size == 1 else ['{}[{}]'.format(name, i) for i in range(size)]
+            width += size
+        self._block = np.empty((self.block_size, width))
+
+        self._file = gzip.open(self.filename, 'wb') if self.compress else io.open(self.filename, 'wb')
+        self._file.write((','.join((['id'] if self.include_id else []) + names) + '\n').encode('utf-8'))
+        self._writer = threading.Thread(target=self._write_blocks)
+        self._writer.daemon = True
+        self._writer.start()
+
+    def record_iteration(self, params, unknowns, resids, metadata):
+        if self._error is not None:
+            raise self._error
+
+        row = self._block[len(self._ids)]
+        for name, columns in self._columns:
+            row[columns] = unknowns[name]
+        self._ids.append(format_iteration_coordinate(metadata['coord']))
+
+        if len(self._ids) == self.block_size:
+            self._queue.put((self._ids, self._block))
+            self._ids = []
+            self._block = np.empty_like(self._block)
+
+    def _write_blocks(self):
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                ids, block = item
+                text = io.BytesIO()
+                np.savetxt(text, block[:len(ids)], fmt=self.fmt, delimiter=',')
+                lines = text.getvalue()
+                if self.include_id:
+                    lines = b''.join(i.encode('utf-8') + b',' + line + b'\n' for i, line in zip(ids, lines.splitlines()))
+                self._file.write(lines)
+        except Exception as error:
+            self._error = error
+            while self._queue.get() is not None:  # keep draining so the driver never blocks on a dead writer
+                pass
+
+    def record_metadata(self, group):
+        pass
+
+    def record_derivatives(self, derivs, metadata):
+        pass
+
+    def close(self):
+        if self._writer is not None:
+            if self._ids:
+                self._queue.put((self._ids, self._block))
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+            self._file.close()
+        super(DriverCsvRecorder, self).close()
+        if self._error is not None:
+            raise self._error